@@ -2,13 +2,16 @@
 
 """A reusable blueprint for the Biolookup Service."""
 
+import gzip
 import logging
 import os
 import time
+from functools import lru_cache
+from typing import Optional
 
-from flask import Blueprint, jsonify
+from flask import Blueprint, Response, abort, jsonify, request
 
-from .proxies import backend
+from .proxies import get_resolver_backend
 from ..constants import DEFAULT_URL
 
 __all__ = [
@@ -18,6 +21,49 @@ __all__ = [
 logger = logging.getLogger(__name__)
 biolookup_blueprint = Blueprint("biolookup", __name__)
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None  # type: ignore[assignment]
+
+try:
+    from humanize.filesize import naturalsize
+except ImportError:
+    naturalsize = None  # type: ignore[assignment]
+
+
+#: Responses smaller than this many bytes aren't worth compressing
+MINIMUM_COMPRESS_SIZE = 1024
+
+#: The maximum number of CURIEs that can be looked up in a single request
+MAX_BATCH_SIZE = 1000
+
+
+def _jsonify(obj, max_age: Optional[int] = None) -> Response:
+    # serializing is a large part of the time spent on fast lookups and on
+    # big responses like the summary, so use orjson if it's available
+    if orjson is None:
+        response = jsonify(obj)
+    else:
+        response = Response(
+            orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY),
+            mimetype="application/json",
+        )
+    if max_age is not None:
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age
+    response.vary.add("Accept-Encoding")
+    if "gzip" in request.accept_encodings and len(response.data) >= MINIMUM_COMPRESS_SIZE:
+        # JSON with lots of repeated keys and prefixes compresses very well
+        response.data = gzip.compress(response.data, compresslevel=6)
+        response.headers["Content-Encoding"] = "gzip"
+    return response
+
 
 @biolookup_blueprint.route("/lookup/<curie>")
 def lookup(curie: str):
@@ -40,18 +86,61 @@ def lookup(curie: str):
         type: string
         example: doid:14330
     """  # noqa:DAR101,DAR201
-    logger.debug("querying %s", curie)
-    start = time.time()
-    rv = backend.lookup(curie)
-    logger.debug("queried %s in %.2f seconds", curie, time.time() - start)
-    rv["providers"]["biolookup"] = f"{DEFAULT_URL}/{curie}"
-    return jsonify(rv)
+    if logger.isEnabledFor(logging.DEBUG):
+        start = time.perf_counter()
+        rv = dict(get_resolver_backend().lookup(curie))
+        logger.debug("queried %s in %.4f seconds", curie, time.perf_counter() - start)
+    else:
+        rv = dict(get_resolver_backend().lookup(curie))
+    # results can be shared by the backend's cache, so don't modify them in place
+    rv["providers"] = {**rv.get("providers", {}), "biolookup": f"{DEFAULT_URL}/{curie}"}
+    return _jsonify(rv)
+
+
+@biolookup_blueprint.route("/lookup", methods=["POST"])
+def lookup_many():
+    """Lookup several CURIEs at once.
+
+    This endpoint takes a JSON object with a ``curies`` key listing the CURIEs to look up
+    and returns a list with a result for each, in the same order. It's more efficient than
+    looking up each CURIE separately since the backend can batch its queries. At most
+    1000 CURIEs can be looked up in a single request.
+    ---
+    parameters:
+      - name: body
+        in: body
+        description: an object with a list of compact uniform resource identifiers (CURIEs)
+        required: true
+        schema:
+          type: object
+          properties:
+            curies:
+              type: array
+              items:
+                type: string
+              example: ["doid:14330", "go:0000073"]
+    """  # noqa:DAR101,DAR201
+    data = request.get_json(silent=True)
+    curies = data.get("curies") if isinstance(data, dict) else None
+    if not isinstance(curies, list) or not all(isinstance(curie, str) for curie in curies):
+        abort(400, "expected a JSON object with a list of strings in the 'curies' key")
+    if len(curies) > MAX_BATCH_SIZE:
+        abort(400, f"can not look up more than {MAX_BATCH_SIZE} CURIEs at once")
+    rv = []
+    for curie, result in zip(curies, get_resolver_backend().lookup_many(curies)):
+        result = dict(result)
+        result["providers"] = {
+            **result.get("providers", {}),
+            "biolookup": f"{DEFAULT_URL}/{curie}",
+        }
+        rv.append(result)
+    return _jsonify(rv)
 
 
 @biolookup_blueprint.route("/summary.json")
 def summary_json():
     """Summary of the content in the service."""
-    return jsonify(backend.summarize_names())
+    return _jsonify(get_resolver_backend().summarize_names(), max_age=300)
 
 
 @biolookup_blueprint.route("/size")
@@ -60,15 +149,19 @@ def size():
 
     Doesn't work if you're running with Gunicorn because it makes child processes.
     """  # noqa:DAR201
-    try:
-        import psutil
-    except ImportError:
-        return jsonify({})
-    from humanize.filesize import naturalsize
-
-    process = psutil.Process(os.getpid())
+    process = _get_process(os.getpid())
+    if process is None:
+        return _jsonify({})
     n_bytes = process.memory_info().rss  # in bytes
-    return jsonify(
-        n_bytes=n_bytes,
-        n_bytes_human=naturalsize(n_bytes),
-    )
+    rv = dict(n_bytes=n_bytes)
+    if naturalsize is not None:
+        rv["n_bytes_human"] = naturalsize(n_bytes)
+    return _jsonify(rv)
+
+
+@lru_cache(maxsize=None)
+def _get_process(pid: int):
+    # keyed by the PID so forked workers don't report on their parent
+    if psutil is None:
+        return None
+    return psutil.Process(pid)
@@ -5,7 +5,7 @@
 import pathlib
 
 import bioregistry
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib_venn import venn2
 
 from biolookup import backends
@@ -20,10 +20,12 @@ def main():
     backend = backends.get_backend(sql=True)
     biolookup_prefixes = set(backend.summarize_names())
     bioregistry_prefixes = set(bioregistry.read_registry())
-    fig, ax = plt.subplots()
+    # use a figure directly instead of pyplot, which would set up a GUI backend
+    # and keep track of the figure globally
+    fig = Figure()
+    ax = fig.subplots()
     venn2([biolookup_prefixes, bioregistry_prefixes], ["Biolookup", "Bioregistry"], ax=ax)
     fig.savefig(STATIC.joinpath("coverage.svg"))
-    plt.close(fig)
 
 
 if __name__ == "__main__":
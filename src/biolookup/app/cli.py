@@ -6,6 +6,7 @@ Run with ``biolookup web``.
 """
 
 import logging
+import os
 import sys
 from typing import Optional
 
@@ -43,9 +44,26 @@ LOG_PATH = MODULE.join(name="log.txt")
 @click.option("--sql-refs-table", help="use preloaded SQL database as backend")
 @click.option("--sql-alts-table", help="use preloaded SQL database as backend")
 @click.option("--sql-defs-table", help="use preloaded SQL database as backend")
+@click.option(
+    "--prepare-statements/--no-prepare-statements",
+    default=True,
+    show_default=True,
+    help="prepare the lookup queries on each PostgreSQL connection when using --sql. Turn this"
+    " off when connecting through a pooler in transaction mode, like PgBouncer",
+)
+@click.option(
+    "--preload",
+    is_flag=True,
+    help="load the names, species, and definitions into memory when using --sql",
+)
 @click.option("--lazy", is_flag=True, help="do no load full cache into memory automatically")
 @click.option("--test", is_flag=True, help="run in test mode with only a few datasets")
-@click.option("--workers", type=int, help="number of workers to use in --gunicorn mode")
+@click.option(
+    "--workers",
+    type=int,
+    help="number of workers to use in --gunicorn mode. Defaults to 2 * CPUs + 1 with --sql"
+    " and without --preload, and otherwise to 1, since each worker keeps its own copy of the lookups in memory",
+)
 @with_gunicorn_option
 @verbose_option
 @debug_option
@@ -57,13 +75,15 @@ def web(
     sql_refs_table: Optional[str],
     sql_alts_table: Optional[str],
     sql_defs_table: Optional[str],
+    prepare_statements: bool,
+    preload: bool,
     name_data: Optional[str],
     alts_data: Optional[str],
     defs_data: Optional[str],
     test: bool,
     with_gunicorn: bool,
     lazy: bool,
-    workers: int,
+    workers: Optional[int],
     debug: bool,
 ):
     """Run the Biolookup Service."""
@@ -78,37 +98,7 @@ def web(
     from .wsgi import get_app
 
     if test:
-        import pandas as pd
-        from pyobo import get_alts_to_id, get_id_definition_mapping, get_id_name_mapping
-
-        prefixes = ["hgnc", "chebi", "doid", "go", "uniprot"]
-        name_data = pd.DataFrame(
-            [
-                (prefix, identifier, name)
-                for prefix in prefixes
-                for identifier, name in get_id_name_mapping(prefix).items()
-            ],
-            columns=["prefix", "identifier", "name"],
-        )
-        click.echo(f"prepared {len(name_data.index):,} test names from {prefixes}")  # type:ignore
-        alts_data = pd.DataFrame(
-            [
-                (prefix, alt, identifier)
-                for prefix in prefixes
-                for alt, identifier in get_alts_to_id(prefix).items()
-            ],
-            columns=["prefix", "alt", "identifier"],
-        )
-        click.echo(f"prepared {len(alts_data.index):,} test alts from {prefixes}")  # type:ignore
-        defs_data = pd.DataFrame(
-            [
-                (prefix, identifier, definition)
-                for prefix in prefixes
-                for identifier, definition in get_id_definition_mapping(prefix).items()
-            ],
-            columns=["prefix", "identifier", "definition"],
-        )
-        click.echo(f"prepared {len(defs_data.index):,} test defs from {prefixes}")  # type:ignore
+        name_data, alts_data, defs_data = _get_test_data(["hgnc", "chebi", "doid", "go", "uniprot"])
 
     app = get_app(
         name_data=name_data,
@@ -120,6 +110,8 @@ def web(
         refs_table=sql_refs_table,
         alts_table=sql_alts_table,
         defs_table=sql_defs_table,
+        prepare_statements=prepare_statements,
+        preload=preload,
     )
 
     # see logging cookbook https://docs.python.org/3/howto/logging-cookbook.html
@@ -137,10 +129,53 @@ def web(
     wsgi.logger.setLevel(logging.DEBUG)
     wsgi.logger.addHandler(fh)
 
+    if with_gunicorn and workers is None:
+        if sql and not preload:
+            # the usual recommendation for gunicorn's sync workers
+            workers = 2 * (os.cpu_count() or 1) + 1
+        else:
+            # Each worker would end up with its own copy of the in-memory lookups. They
+            # aren't shared after forking, since CPython's reference counting writes to
+            # every object that's touched, which defeats copy-on-write
+            workers = 1
+
     run_app(
         app=app, host=host, port=port, with_gunicorn=with_gunicorn, workers=workers, debug=debug
     )
 
 
+def _get_test_data(prefixes):
+    from concurrent.futures import ThreadPoolExecutor
+
+    import pandas as pd
+    from pyobo import get_alts_to_id, get_id_definition_mapping, get_id_name_mapping
+
+    specs = [
+        ("names", get_id_name_mapping, ["prefix", "identifier", "name"]),
+        ("alts", get_alts_to_id, ["prefix", "alt", "identifier"]),
+        ("defs", get_id_definition_mapping, ["prefix", "identifier", "definition"]),
+    ]
+    # The prefixes are independent and mostly wait on the disk and network, so they're
+    # loaded at the same time. The mappings for each prefix are loaded one after another
+    # since they can share the same underlying download and cache files.
+    with ThreadPoolExecutor(max_workers=len(prefixes)) as executor:
+        results = list(
+            executor.map(lambda prefix: [func(prefix) for _, func, _ in specs], prefixes)
+        )
+    rv = []
+    for i, (key, _, columns) in enumerate(specs):
+        df = pd.DataFrame.from_records(
+            (
+                (prefix, left, right)
+                for prefix, mappings in zip(prefixes, results)
+                for left, right in mappings[i].items()
+            ),
+            columns=columns,
+        )
+        click.echo(f"prepared {len(df.index):,} test {key} from {prefixes}")
+        rv.append(df)
+    return rv
+
+
 if __name__ == "__main__":
     web()
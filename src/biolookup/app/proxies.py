@@ -7,6 +7,12 @@ from werkzeug.local import LocalProxy
 
 from ..backends import Backend
 
-__all__ = ["backend"]
+__all__ = ["backend", "get_resolver_backend"]
 
-backend: Backend = LocalProxy(lambda: current_app.config["resolver_backend"])
+
+def get_resolver_backend() -> Backend:
+    """Get the current app's backend without going through a proxy."""
+    return current_app.config["resolver_backend"]
+
+
+backend: Backend = LocalProxy(get_resolver_backend)
@@ -6,75 +6,96 @@ Run with ``python -m biolookup.app``
 """
 
 import logging
-from typing import Optional, Union
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional, Union
 
 import bioregistry
-import pandas as pd
 from flasgger import Swagger
-from flask import Blueprint, Flask, abort, redirect, render_template, url_for
+from flask import Blueprint, Flask, abort, current_app, render_template, request
 from flask_bootstrap import Bootstrap
+from jinja2 import FileSystemBytecodeCache
 
 from .blueprints import biolookup_blueprint
-from .proxies import backend
+from .proxies import get_resolver_backend
 from ..backends import Backend, get_backend
+from ..backends.backend import _parse_curie
+from ..constants import MODULE
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 logger = logging.getLogger(__name__)
 
 ui = Blueprint("ui", __name__)
 
+#: The Cache-Control header for pages, which only change when the data is updated
+UI_CACHE_CONTROL = "public, max-age=3600, stale-while-revalidate=86400"
+
+
+#: The thresholds and suffixes for abbreviating large numbers, largest first
+_TIERS = ((1_000_000, "M"), (1_000, "K"))
+
 
 def _figure_number(n):
-    if n > 1_000_000:
-        lead = n / 1_000_000
-        if lead < 10:
-            return round(lead, 1), "M"
-        else:
-            return round(lead), "M"
-    if n > 1_000:
-        lead = n / 1_000
-        if lead < 10:
-            return round(lead, 1), "K"
-        else:
-            return round(lead), "K"
+    for size, suffix in _TIERS:
+        if n > size:
+            # round half up with integer arithmetic, to one decimal place for small leads
+            if n < 10 * size:
+                return (20 * n // size + 1) // 2 / 10, suffix
+            return (2 * n // size + 1) // 2, suffix
+    return n, ""
+
+
+@ui.after_request
+def _add_cache_headers(response):
+    if request.method == "GET" and response.status_code == 200:
+        response.headers["Cache-Control"] = UI_CACHE_CONTROL
+        # the ETag is a hash of the page, so it changes whenever the content does,
+        # and repeat requests that send it back get an empty 304 response
+        response.add_etag()
+        response.make_conditional(request)
+    return response
 
 
 @ui.route("/")
 def home():
     """Serve the home page."""
-    name_count, name_suffix = _figure_number(backend.count_names())
-    alts_count, alts_suffix = _figure_number(backend.count_alts())
-    defs_count, defs_suffix = _figure_number(backend.count_definitions())
-    species_count, species_suffix = _figure_number(backend.count_species())
-    synonyms_count, synonyms_suffix = _figure_number(backend.count_synonyms())
-    xrefs_count, xrefs_suffix = _figure_number(backend.count_xrefs())
-    rels_count, rels_suffix = _figure_number(backend.count_rels())
-    return render_template(
-        "home.html",
-        name_count=name_count,
-        name_suffix=name_suffix,
-        alts_count=alts_count,
-        alts_suffix=alts_suffix,
-        prefix_count=backend.count_prefixes(),
-        definition_count=defs_count,
-        definition_suffix=defs_suffix,
-        species_count=species_count,
-        species_suffix=species_suffix,
-        synonyms_count=synonyms_count,
-        synonyms_suffix=synonyms_suffix,
-        xrefs_count=xrefs_count,
-        xrefs_suffix=xrefs_suffix,
-        rels_count=rels_count,
-        rels_suffix=rels_suffix,
-    )
+    # the page only shows counts that don't change while the app is running,
+    # so it's only rendered once
+    html = current_app.config.get("home_html")
+    if html is None:
+        html = render_template("home.html", **_get_home_context(get_resolver_backend()))
+        current_app.config["home_html"] = html
+    return html
+
+
+def _get_home_context(backend: Backend) -> Dict[str, Any]:
+    counts = backend.count_all()
+    rv = dict(prefix_count=counts["prefixes"])
+    for key, count_key in [
+        ("name", "names"),
+        ("alts", "alts"),
+        ("definition", "definitions"),
+        ("species", "species"),
+        ("synonyms", "synonyms"),
+        ("xrefs", "xrefs"),
+        ("rels", "rels"),
+    ]:
+        rv[f"{key}_count"], rv[f"{key}_suffix"] = _figure_number(counts[count_key])
+    return rv
 
 
 @ui.route("/statistics")
 def summary():
     """Serve the summary page."""
-    return render_template(
-        "statistics.html",
-        summary_df=backend.summary_df(),
-    )
+    # like the home page, this is built from data that doesn't change while
+    # the app is running, so the dataframe is only built and rendered once
+    html = current_app.config.get("statistics_html")
+    if html is None:
+        html = render_template("statistics.html", summary_df=get_resolver_backend().summary_df())
+        current_app.config["statistics_html"] = html
+    return html
 
 
 @ui.route("/about")
@@ -98,24 +119,23 @@ def usage():
 @ui.route("/<curie>")
 def entity(curie: str):
     """Serve an entity page."""
-    prefix, identifier = bioregistry.parse_curie(curie)
+    prefix, identifier = _parse_curie(curie)
     if prefix is None:
         # TODO use parse logic from bioregistry
         abort(404, "invalid CURIE")
 
+    # Rather than redirecting non-normalized CURIEs, which costs the client another
+    # round trip, the page is served directly and points to the normalized one
     norm_curie = f"{prefix}:{identifier}"
-    if norm_curie != curie:
-        return redirect(url_for(".entity", curie=norm_curie))
-
-    res = backend.lookup(curie)
-    return render_template("entity.html", res=res)
+    res = get_resolver_backend().lookup(norm_curie)
+    return render_template("entity.html", res=res, canonical_curie=norm_curie)
 
 
 def get_app(
-    name_data: Union[None, str, pd.DataFrame] = None,
-    alts_data: Union[None, str, pd.DataFrame] = None,
-    defs_data: Union[None, str, pd.DataFrame] = None,
-    species_data: Union[None, str, pd.DataFrame] = None,
+    name_data: Union[None, str, "pd.DataFrame"] = None,
+    alts_data: Union[None, str, "pd.DataFrame"] = None,
+    defs_data: Union[None, str, "pd.DataFrame"] = None,
+    species_data: Union[None, str, "pd.DataFrame"] = None,
     lazy: bool = False,
     sql: bool = False,
     uri: Optional[str] = None,
@@ -123,6 +143,9 @@ def get_app(
     alts_table: Optional[str] = None,
     defs_table: Optional[str] = None,
     species_table: Optional[str] = None,
+    engine_kwargs: Optional[Mapping[str, Any]] = None,
+    prepare_statements: bool = True,
+    preload: bool = False,
 ) -> Flask:
     """Build a flask app.
 
@@ -145,6 +168,14 @@ def get_app(
     :param alts_table: Name of the alternative identifiers table in the SQL database
     :param defs_table: Name of the definitions table in the SQL database
     :param species_table: Name of the species table in the SQL database
+    :param engine_kwargs: If using a remote SQL database, kwargs for making the engine such as
+        ``pool_size``. By default, connections are pre-pinged and recycled after five minutes
+        and, except for SQLite, up to 10 are pooled with 20 more allowed under load.
+    :param prepare_statements: If using a remote PostgreSQL database, should the lookup
+        queries be prepared on each connection? This should be turned off when connecting
+        through a pooler in transaction mode, like PgBouncer.
+    :param preload: If using a remote SQL database, should the names, species, and
+        definitions be loaded into memory when the app is built?
     :return: A pre-built flask app.
     """
     backend = get_backend(
@@ -159,6 +190,9 @@ def get_app(
         alts_table=alts_table,
         defs_table=defs_table,
         species_table=species_table,
+        engine_kwargs=engine_kwargs,
+        prepare_statements=prepare_statements,
+        preload=preload,
     )
     return get_app_from_backend(backend)
 
@@ -189,15 +223,34 @@ def get_app_from_backend(backend: Backend) -> Flask:
     Bootstrap(app)
 
     app.config["resolver_backend"] = backend
+
+    # Static files are versioned by their modification time (see below), so
+    # browsers can cache them for a long time without serving stale copies
+    app.config["SEND_FILE_MAX_AGE_DEFAULT"] = 31_536_000
+
+    @app.url_defaults
+    def _add_static_version(endpoint, values):
+        if endpoint == "static" and "filename" in values:
+            path = os.path.join(app.static_folder, values["filename"])
+            if os.path.isfile(path):
+                values["v"] = int(os.stat(path).st_mtime)
+
     app.register_blueprint(ui)
     app.register_blueprint(biolookup_blueprint, url_prefix="/api")
 
+    # Keep compiled templates on disk so each new worker doesn't parse them again
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(str(MODULE.join("jinja")))
+
     # Make bioregistry available in all jinja templates
     app.jinja_env.globals.update(bioregistry=bioregistry)
 
     @app.before_first_request
     def _before_first_request():
         logger.info("before_first_request")
-        backend.count_all()
+        # Warming up can take a while against a big database, so it happens in the
+        # background instead of holding up the first request. It isn't started when
+        # the app is built because gunicorn forks the workers after that, and threads
+        # and database connections don't survive the fork.
+        threading.Thread(target=backend.warm_up, name="biolookup-warm-up", daemon=True).start()
 
     return app
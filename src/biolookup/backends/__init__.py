@@ -2,15 +2,18 @@
 
 """Backends for the Biolookup Service."""
 
+from .arrow_backend import ArrowBackend
 from .backend import Backend
 from .memory_backend import MemoryBackend
 from .remote_backend import RemoteBackend
 from .resolve import get_backend
-from .sql_backend import RawSQLBackend
+from .sql_backend import PreloadedSQLBackend, RawSQLBackend
 
 __all__ = [
     "Backend",
+    "ArrowBackend",
     "RawSQLBackend",
+    "PreloadedSQLBackend",
     "MemoryBackend",
     "RemoteBackend",
     "get_backend",
@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+
+"""A memory-mapped backend for the Biolookup Service based on Apache Arrow.
+
+Each of the three-column (prefix, identifier, value) dumps is converted once
+into an uncompressed Arrow IPC file sorted by prefix and identifier. The files
+are then memory-mapped, so loading is nearly instant, strings aren't turned
+into Python objects until they're looked up, and worker processes share the
+same pages through the operating system's page cache.
+
+This backend requires :mod:`pyarrow`, which can be installed with
+``pip install biolookup[arrow]``.
+"""
+
+import logging
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
+
+from .backend import CACHE_SIZE, Backend
+from ..constants import MODULE
+
+__all__ = [
+    "ArrowBackend",
+]
+
+logger = logging.getLogger(__name__)
+
+#: Generic names for the columns of the three-column tables
+COLUMNS = ["prefix", "key", "value"]
+
+
+def write_arrow_table(
+    source: Union[str, Path], target: Union[str, Path], *, reverse: bool = False
+) -> None:
+    """Convert a gzipped three-column TSV into a sorted Arrow IPC file.
+
+    :param source: The path to a gzipped TSV file with a header and three columns
+        (prefix, identifier, value)
+    :param target: The path where the Arrow IPC file is written
+    :param reverse: Should the third column be used as the key instead of the second?
+        This is the case for the alts dump, which has prefix, identifier, and alt columns
+        but is looked up by alt.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv
+    import pyarrow.feather
+
+    logger.info("converting %s to %s", source, target)
+    table = pyarrow.csv.read_csv(
+        source,
+        # the header is replaced with generic column names since it differs between dumps
+        read_options=pyarrow.csv.ReadOptions(
+            column_names=["prefix", "value", "key"] if reverse else COLUMNS, skip_rows=1
+        ),
+        parse_options=pyarrow.csv.ParseOptions(delimiter="\t", quote_char=False),
+        convert_options=pyarrow.csv.ConvertOptions(
+            column_types={column: pa.string() for column in COLUMNS}
+        ),
+    )
+    table = table.select(COLUMNS).sort_by([("prefix", "ascending"), ("key", "ascending")])
+    table = table.set_column(0, "prefix", pc.dictionary_encode(table["prefix"]))
+    # Compression and chunking would both get in the way of zero-copy random access
+    pyarrow.feather.write_feather(
+        table, str(target), compression="uncompressed", chunksize=max(1, table.num_rows)
+    )
+
+
+def _get_array(chunked_array):
+    # avoid copying out of the memory map when there's only a single chunk
+    if chunked_array.num_chunks == 1:
+        return chunked_array.chunk(0)
+    return chunked_array.combine_chunks()
+
+
+class _ArrowLookup:
+    """A lookup over a memory-mapped, sorted three-column Arrow table."""
+
+    def __init__(self, path: Union[str, Path]):
+        import numpy as np
+        import pyarrow as pa
+
+        table = pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+        self.keys = _get_array(table["key"])
+        self.values = _get_array(table["value"])
+
+        # The table is sorted by prefix before dictionary encoding, so the dictionary
+        # is in sorted order and each prefix covers a contiguous range of rows
+        prefixes = _get_array(table["prefix"])
+        counts = np.bincount(prefixes.indices.to_numpy(), minlength=len(prefixes.dictionary))
+        self.ranges: Dict[str, Tuple[int, int]] = {}
+        start = 0
+        for prefix, count in zip(prefixes.dictionary.to_pylist(), counts.tolist()):
+            self.ranges[prefix] = start, start + count
+            start += count
+
+    def get(self, prefix: str, key: str) -> Optional[str]:
+        bounds = self.ranges.get(prefix)
+        if bounds is None:
+            return None
+        low, high = bounds
+        while low < high:
+            middle = (low + high) // 2
+            if self.keys[middle].as_py() < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < bounds[1] and self.keys[low].as_py() == key:
+            return self.values[low].as_py()
+        return None
+
+    def summarize(self) -> Mapping[str, int]:
+        return {prefix: stop - start for prefix, (start, stop) in self.ranges.items()}
+
+
+class ArrowBackend(Backend):
+    """A resolution service using memory-mapped Apache Arrow tables."""
+
+    def __init__(
+        self,
+        names_path: Union[str, Path],
+        *,
+        alts_path: Union[None, str, Path] = None,
+        definitions_path: Union[None, str, Path] = None,
+        species_path: Union[None, str, Path] = None,
+    ) -> None:
+        """Initialize the Arrow backend.
+
+        :param names_path: The path to an Arrow file with prefix, identifier, and name columns
+        :param alts_path: The path to an Arrow file with prefix, alternate identifier, and
+            identifier columns
+        :param definitions_path: The path to an Arrow file with prefix, identifier, and
+            definition columns
+        :param species_path: The path to an Arrow file with prefix, identifier, and species columns
+
+        .. seealso:: Use :meth:`ArrowBackend.from_tsvs` to build these files from the gzipped TSV dumps
+        """
+        self.names = _ArrowLookup(names_path)
+        self.alts = _ArrowLookup(alts_path) if alts_path else None
+        self.definitions = _ArrowLookup(definitions_path) if definitions_path else None
+        self.species = _ArrowLookup(species_path) if species_path else None
+
+    @classmethod
+    def from_tsvs(
+        cls,
+        *,
+        names: Union[None, str, Path] = None,
+        alts: Union[None, str, Path] = None,
+        definitions: Union[None, str, Path] = None,
+        species: Union[None, str, Path] = None,
+        directory: Union[None, str, Path] = None,
+        force: bool = False,
+    ) -> "ArrowBackend":
+        """Build Arrow files from the gzipped TSV dumps, if they don't already exist, and load them.
+
+        :param names: The path to the names TSV. If none, uses the latest from Zenodo.
+        :param alts: The path to the alts TSV. If none, uses the latest from Zenodo.
+        :param definitions: The path to the definitions TSV. If none, uses the latest from Zenodo.
+        :param species: The path to the species TSV. If none, uses the latest from Zenodo.
+        :param directory: The directory in which the Arrow files are stored. Defaults to
+            ``~/.data/biolookup/arrow``.
+        :param force: Should the Arrow files be rebuilt even if they already exist?
+        :return: An Arrow backend
+        """
+        from pyobo.resource_utils import (
+            ensure_alts,
+            ensure_definitions,
+            ensure_ooh_na_na,
+            ensure_species,
+        )
+
+        directory = Path(directory) if directory is not None else MODULE.join("arrow")
+        directory.mkdir(parents=True, exist_ok=True)
+        paths = {}
+        for key, source, default in [
+            ("names", names, ensure_ooh_na_na),
+            ("alts", alts, ensure_alts),
+            ("definitions", definitions, ensure_definitions),
+            ("species", species, ensure_species),
+        ]:
+            target = directory.joinpath(f"{key}.arrow")
+            if force or not target.is_file():
+                write_arrow_table(
+                    source if source is not None else default(), target, reverse=key == "alts"
+                )
+            paths[key] = target
+        return cls(
+            paths["names"],
+            alts_path=paths["alts"],
+            definitions_path=paths["definitions"],
+            species_path=paths["species"],
+        )
+
+    @lru_cache(maxsize=CACHE_SIZE)
+    def _lookup_reference(
+        self, prefix: str, identifier: str, *, resolve_alternate: bool = True
+    ) -> Mapping[str, Any]:
+        # each lookup does several binary searches that convert Arrow scalars
+        # to Python objects, so results for popular entities are kept
+        return super()._lookup_reference(prefix, identifier, resolve_alternate=resolve_alternate)
+
+    def has_prefix(self, prefix: str) -> bool:
+        """Check for the prefix in the names table."""
+        return prefix in self.names.ranges
+
+    def get_primary_id(self, prefix: str, identifier: str) -> str:
+        """Get the canonical identifier from the alts table."""
+        if self.alts is None:
+            return identifier
+        return self.alts.get(prefix, identifier) or identifier
+
+    def get_name(self, prefix: str, identifier: str) -> Optional[str]:
+        """Get the name from the names table."""
+        return self.names.get(prefix, identifier)
+
+    def get_species(self, prefix: str, identifier: str) -> Optional[str]:
+        """Get the species from the species table, if available."""
+        if self.species is None:
+            return None
+        return self.species.get(prefix, identifier)
+
+    def get_definition(self, prefix: str, identifier: str) -> Optional[str]:
+        """Get the definition from the definitions table, if available."""
+        if self.definitions is None:
+            return None
+        return self.definitions.get(prefix, identifier)
+
+    def summarize_names(self) -> Mapping[str, Any]:
+        """Summarize the names table."""
+        return self.names.summarize()
+
+    def summarize_alts(self) -> Mapping[str, Any]:
+        """Summarize the alts table, if available."""
+        return self.alts.summarize() if self.alts is not None else {}
+
+    def summarize_definitions(self) -> Mapping[str, Any]:
+        """Summarize the definitions table, if available."""
+        return self.definitions.summarize() if self.definitions is not None else {}
+
+    def summarize_species(self) -> Mapping[str, Any]:
+        """Summarize the species table, if available."""
+        return self.species.summarize() if self.species is not None else {}
+
+    def count_prefixes(self) -> int:
+        """Count prefixes using the names table."""
+        return len(self.names.ranges)
+
+    def count_names(self) -> int:
+        """Count names using the names table."""
+        return len(self.names.keys)
+
+    def count_alts(self) -> int:
+        """Count alts using the alts table."""
+        return len(self.alts.keys) if self.alts is not None else 0
+
+    def count_definitions(self) -> int:
+        """Count definitions using the definitions table."""
+        return len(self.definitions.keys) if self.definitions is not None else 0
+
+    def count_species(self) -> int:
+        """Count species using the species table."""
+        return len(self.species.keys) if self.species is not None else 0
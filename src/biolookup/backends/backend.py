@@ -3,10 +3,28 @@
 """Base class for backends."""
 
 import logging
-from typing import Any, List, Mapping, Optional
+import re
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    ClassVar,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Pattern,
+    Set,
+    Tuple,
+)
 
 import bioregistry
-import pandas as pd
+
+from ..constants import get_cache_size
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 __all__ = [
     "Backend",
@@ -15,10 +33,84 @@ __all__ = [
 
 logger = logging.getLogger(__name__)
 
+#: The maximum size of each of the lookup caches
+CACHE_SIZE = get_cache_size()
+
+#: Stands in for the identifier when rendering a prefix's provider URLs
+_IDENTIFIER_PLACEHOLDER = "BIOLOOKUPIDENTIFIERPLACEHOLDER"
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_curie(curie: str) -> Tuple[Optional[str], Optional[str]]:
+    # the Bioregistry's parsing checks several synonyms and patterns, and the
+    # same CURIEs tend to get looked up over and over
+    return bioregistry.parse_curie(curie)
+
+
+@lru_cache(maxsize=None)
+def _get_provider_templates(prefix: str) -> Optional[Mapping[str, str]]:
+    templates = bioregistry.get_providers(prefix, _IDENTIFIER_PLACEHOLDER) or {}
+    if any(_IDENTIFIER_PLACEHOLDER not in uri for uri in templates.values()):
+        # some provider does more than substitute the identifier into its URI format
+        return None
+    return templates
+
+
+@lru_cache(maxsize=None)
+def _get_pattern(prefix: str) -> Optional[Pattern]:
+    pattern = bioregistry.get_pattern(prefix)
+    return re.compile(pattern) if pattern else None
+
+
+def _get_providers(prefix: str, identifier: str) -> Dict[str, str]:
+    # The provider URL templates are only rendered once per prefix. They can only be used
+    # for identifiers that match the prefix's pattern, since the Bioregistry normalizes
+    # others, e.g., by removing a redundant prefix like in CHEBI:CHEBI:1234
+    templates = _get_provider_templates(prefix)
+    pattern = _get_pattern(prefix)
+    if templates is None or pattern is None or not pattern.match(identifier):
+        return dict(bioregistry.get_providers(prefix, identifier) or {})
+    return {
+        provider: template.replace(_IDENTIFIER_PLACEHOLDER, identifier)
+        for provider, template in templates.items()
+    }
+
+
+@lru_cache(maxsize=None)
+def _get_prefix_metadata(
+    prefix: str,
+) -> Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]:
+    example = bioregistry.get_example(prefix)
+    return (
+        bioregistry.get_name(prefix),
+        bioregistry.get_homepage(prefix),
+        example,
+        bioregistry.get_link(prefix, example),
+    )
+
+
+#: The backend classes and features that have already been warned about
+_WARNED_NOT_IMPLEMENTED: Set[Tuple[type, str]] = set()
+
+
+def _warn_not_implemented(cls: type, what: str) -> None:
+    # only warn the first time for each backend class, rather than on every call
+    if (cls, what) in _WARNED_NOT_IMPLEMENTED:
+        return
+    _WARNED_NOT_IMPLEMENTED.add((cls, what))
+    logger.warning("getting %s is not yet implemented for %s", what, cls)
+
 
 class Backend:
     """A resolution service."""
 
+    #: Does this backend implement :meth:`get_synonyms`? If not, lookups skip it
+    supports_synonyms: ClassVar[bool] = False
+    #: Does this backend implement :meth:`get_xrefs`? If not, lookups skip it
+    supports_xrefs: ClassVar[bool] = False
+    #: Does this backend implement :meth:`get_rels`? If not, lookups skip it
+    supports_rels: ClassVar[bool] = False
+
     def has_prefix(self, prefix: str) -> bool:
         """Check if there is a resource available with the given prefix."""
         raise NotImplementedError
@@ -41,17 +133,17 @@ class Backend:
 
     def get_synonyms(self, prefix: str, identifier: str) -> List[str]:
         """Get a list of synonyms."""
-        logger.warning(f"getting synonyms is not yet implemented for {self.__class__}")
+        _warn_not_implemented(self.__class__, "synonyms")
         return []
 
     def get_xrefs(self, prefix: str, identifier: str) -> List[Mapping[str, str]]:
         """Get a list of xrefs."""
-        logger.warning(f"getting xrefs is not yet implemented for {self.__class__}")
+        _warn_not_implemented(self.__class__, "xrefs")
         return []
 
     def get_rels(self, prefix: str, identifier: str) -> List[Mapping[str, str]]:
         """Get a list of relations."""
-        logger.warning(f"getting relations is not yet implemented for {self.__class__}")
+        _warn_not_implemented(self.__class__, "relations")
         return []
 
     def summarize_names(self) -> Mapping[str, Any]:
@@ -82,16 +174,26 @@ class Backend:
         """Summarize the relations."""
         raise NotImplementedError
 
-    def count_all(self):
-        """Count all."""
-        self.count_prefixes()
-        self.count_definitions()
-        self.count_alts()
-        self.count_names()
-        self.count_species()
-        self.count_synonyms()
-        self.count_xrefs()
-        self.count_rels()
+    def count_all(self) -> Dict[str, Optional[int]]:
+        """Count all.
+
+        :return: A dictionary from the names of the counts to their values,
+            e.g., ``{"names": 6, ...}``
+        """
+        return dict(
+            prefixes=self.count_prefixes(),
+            definitions=self.count_definitions(),
+            alts=self.count_alts(),
+            names=self.count_names(),
+            species=self.count_species(),
+            synonyms=self.count_synonyms(),
+            xrefs=self.count_xrefs(),
+            rels=self.count_rels(),
+        )
+
+    def warm_up(self) -> None:
+        """Prepare the backend to serve requests, e.g., by filling caches."""
+        self.count_all()
 
     def count_names(self) -> Optional[int]:
         """Count the number of names in the database."""
@@ -119,36 +221,40 @@ class Backend:
 
     def lookup(self, curie: str, *, resolve_alternate: bool = True) -> Mapping[str, Any]:
         """Return the results and summary when resolving a CURIE string."""
-        prefix, identifier = bioregistry.parse_curie(curie)
+        prefix, identifier = _parse_curie(curie)
         if prefix is None or identifier is None:
             return dict(
                 query=curie,
                 success=False,
                 message="Could not identify prefix",
             )
+        return dict(
+            query=curie,
+            **self._lookup_reference(prefix, identifier, resolve_alternate=resolve_alternate),
+        )
 
-        providers = bioregistry.get_providers(prefix, identifier)
+    def _lookup_reference(
+        self, prefix: str, identifier: str, *, resolve_alternate: bool = True
+    ) -> Mapping[str, Any]:
+        providers = _get_providers(prefix, identifier)
         if not self.has_prefix(prefix):
-            rv = dict(
-                query=curie,
+            return dict(
                 prefix=prefix,
                 identifier=identifier,
                 providers=providers,
                 success=False,
                 message=f"Could not find id->name mapping for {prefix}",
             )
-            return rv
 
         name = self.get_name(prefix, identifier)
         if name is None and resolve_alternate:
             identifier, _secondary_id = self.get_primary_id(prefix, identifier), identifier
             if identifier != _secondary_id:
-                providers = bioregistry.get_providers(prefix, identifier)
+                providers = _get_providers(prefix, identifier)
                 name = self.get_name(prefix, identifier)
 
         if name is None:
             return dict(
-                query=curie,
                 prefix=prefix,
                 identifier=identifier,
                 success=False,
@@ -156,7 +262,6 @@ class Backend:
                 message="Could not look up identifier",
             )
         rv = dict(
-            query=curie,
             prefix=prefix,
             identifier=identifier,
             name=name,
@@ -169,20 +274,30 @@ class Backend:
         species = self.get_species(prefix, identifier)
         if species:
             rv["species"] = species
-        synonyms = self.get_synonyms(prefix, identifier)
+        synonyms = self.get_synonyms(prefix, identifier) if self.supports_synonyms else None
         if synonyms:
             rv["synonyms"] = synonyms
-        xrefs = self.get_xrefs(prefix, identifier)
+        xrefs = self.get_xrefs(prefix, identifier) if self.supports_xrefs else None
         if xrefs:
             rv["xrefs"] = xrefs
-        rels = self.get_rels(prefix, identifier)
+        rels = self.get_rels(prefix, identifier) if self.supports_rels else None
         if rels:
             rv["relations"] = rels
 
         return rv
 
-    def summary_df(self) -> pd.DataFrame:
+    def lookup_many(
+        self, curies: Iterable[str], *, resolve_alternate: bool = True
+    ) -> List[Mapping[str, Any]]:
+        """Return the results and summaries when resolving several CURIE strings."""
+        return [self.lookup(curie, resolve_alternate=resolve_alternate) for curie in curies]
+
+    def summary_df(self) -> "pd.DataFrame":
         """Generate a summary dataframe."""
+        # pandas is slow to import and only needed here, e.g., not when using the remote backend
+        import numpy as np
+        import pandas as pd
+
         summary_names = self.summarize_names()
         summary_alts = self.summarize_alts() if self.summarize_alts is not None else {}
         summary_defs = (
@@ -192,36 +307,27 @@ class Backend:
         summary_synonyms = self.summarize_synonyms() if self.summarize_synonyms is not None else {}
         summary_xrefs = self.summarize_xrefs() if self.summarize_xrefs is not None else {}
         summary_rels = self.summarize_rels() if self.summarize_rels is not None else {}
-        return pd.DataFrame(
-            [
-                (
-                    prefix,
-                    bioregistry.get_name(prefix),
-                    bioregistry.get_homepage(prefix),
-                    bioregistry.get_example(prefix),
-                    bioregistry.get_link(prefix, bioregistry.get_example(prefix)),
-                    names_count,
-                    summary_alts.get(prefix, 0),
-                    summary_defs.get(prefix, 0),
-                    summary_species.get(prefix, 0),
-                    summary_synonyms.get(prefix, 0),
-                    summary_xrefs.get(prefix, 0),
-                    summary_rels.get(prefix, 0),
-                )
-                for prefix, names_count in summary_names.items()
-            ],
-            columns=[
-                "prefix",
-                "name",
-                "homepage",
-                "example",
-                "link",
-                "names",
-                "alts",
-                "defs",
-                "species",
-                "synonyms",
-                "xrefs",
-                "rels",
-            ],
-        )
+        prefixes = list(summary_names)
+        metadata = [_get_prefix_metadata(prefix) for prefix in prefixes]
+        # build each column at once instead of making pandas transpose rows of mixed types
+        data = {
+            "prefix": prefixes,
+            "name": [name for name, _, _, _ in metadata],
+            "homepage": [homepage for _, homepage, _, _ in metadata],
+            "example": [example for _, _, example, _ in metadata],
+            "link": [link for _, _, _, link in metadata],
+        }
+        for key, summary in [
+            ("names", summary_names),
+            ("alts", summary_alts),
+            ("defs", summary_defs),
+            ("species", summary_species),
+            ("synonyms", summary_synonyms),
+            ("xrefs", summary_xrefs),
+            ("rels", summary_rels),
+        ]:
+            # align each summary on the prefixes with an index join rather than a lookup per prefix
+            data[key] = (
+                pd.Series(summary, dtype=np.int64).reindex(prefixes, fill_value=0).to_numpy()
+            )
+        return pd.DataFrame(data)
@@ -2,20 +2,37 @@
 
 """An in-memory backend for the Biolookup Service based on PyOBO functions."""
 
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Any, Callable, List, Mapping, Optional
 
-import pyobo
-
 from .backend import Backend
 
 __all__ = [
     "MemoryBackend",
 ]
 
+#: A shared empty mapping, used instead of allocating a new dict for each miss
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+#: The maximum number of prefixes whose mappings are cached by each getter
+PREFIX_CACHE_SIZE = 32
+
+
+def _memoize(func):
+    if func is None:
+        return None
+    # The getters return whole per-prefix mappings, which would otherwise get loaded by
+    # PyOBO on every call in lazy mode. Only the most recently used prefixes are kept,
+    # since holding on to every prefix that's been looked up is the same as not being lazy
+    return lru_cache(maxsize=PREFIX_CACHE_SIZE)(func)
+
 
 class MemoryBackend(Backend):
     """A resolution service using a dictionary-based in-memory cache."""
 
+    supports_synonyms = True
+
     def __init__(
         self,
         *,
@@ -41,11 +58,15 @@ class MemoryBackend(Backend):
         :param summarize_species: A function for summarizing species
         :param get_id_definition_mapping: A function for getting id-def mappings
         """
-        self.get_id_name_mapping = get_id_name_mapping
-        self.get_id_species_mapping = get_id_species_mapping
-        self.get_alts_to_id = get_alts_to_id
-        self.get_id_definition_mapping = get_id_definition_mapping
-        self.get_id_synonyms_mapping = get_id_synonyms_mapping or pyobo.get_id_synonyms_mapping
+        self.get_id_name_mapping = _memoize(get_id_name_mapping)
+        self.get_id_species_mapping = _memoize(get_id_species_mapping)
+        self.get_alts_to_id = _memoize(get_alts_to_id)
+        self.get_id_definition_mapping = _memoize(get_id_definition_mapping)
+        if get_id_synonyms_mapping is None:
+            import pyobo
+
+            get_id_synonyms_mapping = pyobo.get_id_synonyms_mapping
+        self.get_id_synonyms_mapping = _memoize(get_id_synonyms_mapping)
         self._summarize_names = summarize_names
         self._summarize_alts = summarize_alts
         self._summarize_definitions = summarize_definitions
@@ -57,29 +78,29 @@ class MemoryBackend(Backend):
 
     def get_primary_id(self, prefix: str, identifier: str) -> str:
         """Get the canonical identifier with the alts/id getter."""
-        alts_to_id = self.get_alts_to_id(prefix) or {}
+        alts_to_id = self.get_alts_to_id(prefix) or _EMPTY
         return alts_to_id.get(identifier, identifier)
 
     def get_name(self, prefix: str, identifier: str) -> Optional[str]:
         """Get the name with the id/name getter."""
-        id_name_mapping = self.get_id_name_mapping(prefix) or {}
+        id_name_mapping = self.get_id_name_mapping(prefix) or _EMPTY
         return id_name_mapping.get(identifier)
 
     def get_species(self, prefix: str, identifier: str) -> Optional[str]:
         """Get the species with the id/species getter."""
-        id_species_mapping = self.get_id_species_mapping(prefix) or {}
+        id_species_mapping = self.get_id_species_mapping(prefix) or _EMPTY
         return id_species_mapping.get(identifier)
 
     def get_definition(self, prefix: str, identifier: str) -> Optional[str]:
         """Get the name with the id/definition getter, if available."""
         if self.get_id_definition_mapping is None:
             return None
-        id_definition_mapping = self.get_id_definition_mapping(prefix) or {}
+        id_definition_mapping = self.get_id_definition_mapping(prefix) or _EMPTY
         return id_definition_mapping.get(identifier)
 
     def get_synonyms(self, prefix: str, identifier: str) -> List[str]:
         """Get the synonyms with the id/synonym getter, if available."""
-        x = self.get_id_synonyms_mapping(prefix) or {}
+        x = self.get_id_synonyms_mapping(prefix) or _EMPTY
         return x.get(identifier, [])
 
     def summarize_names(self) -> Mapping[str, Any]:
@@ -88,10 +109,12 @@ class MemoryBackend(Backend):
             return {}
         return self._summarize_names()
 
+    @lru_cache(maxsize=1)
     def count_prefixes(self) -> int:
         """Count prefixes using the name summary."""
         return len(self.summarize_names().keys())
 
+    @lru_cache(maxsize=1)
     def count_names(self) -> int:
         """Count names using the name summary."""
         return sum(self.summarize_names().values())
@@ -102,6 +125,7 @@ class MemoryBackend(Backend):
             return {}
         return self._summarize_alts()
 
+    @lru_cache(maxsize=1)
     def count_alts(self) -> int:
         """Count alts using the alt summary."""
         return sum(self.summarize_alts().values())
@@ -112,6 +136,7 @@ class MemoryBackend(Backend):
             return {}
         return self._summarize_definitions()
 
+    @lru_cache(maxsize=1)
     def count_definitions(self) -> int:
         """Count definitions using the definition summary."""
         return sum(self.summarize_definitions().values())
@@ -122,6 +147,7 @@ class MemoryBackend(Backend):
             return {}
         return self._summarize_species()
 
+    @lru_cache(maxsize=1)
     def count_species(self) -> int:
         """Count species using the species summary."""
         return sum(self.summarize_species().values())
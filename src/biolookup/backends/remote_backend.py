@@ -2,36 +2,157 @@
 
 """A remote backend for the Biolookup Service."""
 
-from typing import Any, Mapping, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Iterable, List, Mapping, Optional, Union
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from .backend import Backend
+from .backend import CACHE_SIZE, Backend
 from ..constants import DEFAULT_ENDPOINT, DEFAULT_URL
 
+#: Parses the response bodies
+_loads: Callable[[Union[str, bytes]], Any]
+
+try:
+    # orjson parses the response bytes directly and is several times faster than json
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    import json
+
+    _loads = json.loads
+
 __all__ = [
     "RemoteBackend",
 ]
 
 
+#: The number of concurrent connections to the service, used for both the pool and batch lookups
+MAX_CONNECTIONS = 16
+
+
+def _get_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_maxsize=MAX_CONNECTIONS,
+        max_retries=Retry(total=3, backoff_factor=0.1, status_forcelist=(502, 503, 504)),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["Accept"] = "application/json"
+    return session
+
+
 class RemoteBackend(Backend):
     """A remote backend."""
 
-    def __init__(self, base_url: Optional[str] = None, endpoint: Optional[str] = None):
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+        timeout: Optional[float] = 5.0,
+        cache_directory: Union[None, str, Path] = None,
+        cache_expire: Optional[float] = 86_400,
+    ):
         """Instantiate the remote backend.
 
         :param base_url: The base URL, defaults to http://biolookup.io
         :param endpoint: The endpoint name. Defaults to ``lookup``. This is configurable since
             some instances might mount the API differently.
+        :param session: A session for making requests. If none is given, one is created so
+            connections to the service are kept alive and reused between lookups, and
+            requests that fail because the service is briefly unavailable are retried.
+        :param timeout: The number of seconds to wait for the service to respond.
+            If none, waits indefinitely.
+        :param cache_directory: A directory in which responses are cached on disk, so they
+            can be reused across runs. This requires :mod:`diskcache`, which can be installed
+            with ``pip install biolookup[diskcache]``. If none, responses are only cached in
+            memory.
+        :param cache_expire: The number of seconds after which responses cached on disk
+            expire. If none, they never expire.
         """
         self.base_url = (base_url or DEFAULT_URL).rstrip("/")
         self.endpoint = (endpoint or DEFAULT_ENDPOINT).strip("/")
+        self.timeout = timeout
+        self.session = session if session is not None else _get_session()
+        self.cache_expire = cache_expire
+        if cache_directory is None:
+            self.disk_cache = None
+        else:
+            import diskcache
+
+            self.disk_cache = diskcache.Cache(str(cache_directory))
+
+    def close(self) -> None:
+        """Close the session's pooled connections and the disk cache, if used."""
+        self.session.close()
+        if self.disk_cache is not None:
+            self.disk_cache.close()
+
+    def __enter__(self) -> "RemoteBackend":
+        """Use the backend as a context manager that closes its session on exit."""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Close the session's pooled connections and the disk cache, if used."""
+        self.close()
 
     def lookup(self, curie: str, *, resolve_alternate: bool = True) -> Mapping[str, Any]:
-        """Lookup the CURIE using the remote service."""
-        res = requests.get(f"{self.base_url}/{self.endpoint}/{curie}")
+        """Lookup the CURIE using the remote service.
+
+        Successful responses are cached, so looking up the same CURIE again doesn't
+        make another request. A shallow copy is returned so callers can add keys
+        without affecting the cache.
+
+        :param curie: The CURIE to look up
+        :param resolve_alternate: Not used, since the remote service always resolves
+            alternate identifiers
+        :return: The service's result for the CURIE
+        """
+        return dict(self._lookup(curie))
+
+    def lookup_many(
+        self, curies: Iterable[str], *, resolve_alternate: bool = True
+    ) -> List[Mapping[str, Any]]:
+        """Lookup several CURIEs using the remote service.
+
+        Requests for the distinct CURIEs are made concurrently, so the total time is
+        closer to that of a few round trips than one per CURIE.
+
+        :param curies: The CURIEs to look up
+        :param resolve_alternate: Not used, since the remote service always resolves
+            alternate identifiers
+        :return: A result for each CURIE, in the same order
+        """
+        curies = list(curies)
+        unique = list(dict.fromkeys(curies))
+        if len(unique) <= 1:
+            results = dict(zip(unique, map(self._lookup, unique)))
+        else:
+            with ThreadPoolExecutor(max_workers=min(MAX_CONNECTIONS, len(unique))) as executor:
+                results = dict(zip(unique, executor.map(self._lookup, unique)))
+        return [dict(results[curie]) for curie in curies]
+
+    @lru_cache(maxsize=CACHE_SIZE)
+    def _lookup(self, curie: str) -> Mapping[str, Any]:
+        url = f"{self.base_url}/{self.endpoint}/{curie}"
+        if self.disk_cache is not None:
+            # the URL includes the base URL and endpoint, so different services don't collide
+            rv = self.disk_cache.get(url)
+            if rv is not None:
+                return rv
+        res = self.session.get(url, timeout=self.timeout)
         res.raise_for_status()
-        return res.json()
+        rv = _loads(res.content)
+        if self.disk_cache is not None:
+            self.disk_cache.set(url, rv, expire=self.cache_expire)
+        return rv
 
 
 def _main():
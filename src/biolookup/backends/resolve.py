@@ -2,19 +2,45 @@
 
 """A resolution function for BLS backends."""
 
-import gzip
+import csv
 import logging
+import os
 from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import DefaultDict, Dict, Mapping, Optional, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    DefaultDict,
+    Dict,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
 
-import pandas as pd
 from sqlalchemy.engine import Engine
 from tqdm import tqdm
 
 from .backend import Backend
 from .memory_backend import MemoryBackend
-from .sql_backend import RawSQLBackend
+from .sql_backend import PreloadedSQLBackend, RawSQLBackend
+
+try:
+    # ISA-L's implementation of DEFLATE is several times faster than zlib's
+    from isal import igzip as gzip
+except ImportError:
+    import gzip
+
+try:
+    # rapidgzip decompresses a single file with several threads
+    import rapidgzip
+except ImportError:
+    rapidgzip = None
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 __all__ = [
     "get_backend",
@@ -22,13 +48,16 @@ __all__ = [
 
 logger = logging.getLogger(__name__)
 
+#: The number of rows parsed at a time when loading a lookup from a file
+CHUNKSIZE = 1_000_000
+
 
 def get_backend(
     *,
-    name_data: Union[None, str, pd.DataFrame] = None,
-    alts_data: Union[None, str, pd.DataFrame] = None,
-    defs_data: Union[None, str, pd.DataFrame] = None,
-    species_data: Union[None, str, pd.DataFrame] = None,
+    name_data: Union[None, str, "pd.DataFrame"] = None,
+    alts_data: Union[None, str, "pd.DataFrame"] = None,
+    defs_data: Union[None, str, "pd.DataFrame"] = None,
+    species_data: Union[None, str, "pd.DataFrame"] = None,
     lazy: bool = False,
     sql: bool = False,
     uri: Union[None, str, Engine] = None,
@@ -39,12 +68,18 @@ def get_backend(
     synonyms_table: Optional[str] = None,
     xrefs_table: Optional[str] = None,
     rels_table: Optional[str] = None,
+    engine_kwargs: Optional[Mapping[str, Any]] = None,
+    preload: bool = False,
+    prepare_statements: bool = True,
 ) -> Backend:
     """Get the backend based on the input data."""
     if sql:
         logger.info("using raw SQL backend")
-        return RawSQLBackend(
+        # preloading keeps the names, species, and definitions in memory
+        cls = PreloadedSQLBackend if preload else RawSQLBackend
+        return cls(
             engine=uri,
+            engine_kwargs=engine_kwargs,
             refs_table=refs_table,
             alts_table=alts_table,
             defs_table=defs_table,
@@ -52,100 +87,134 @@ def get_backend(
             synonyms_table=synonyms_table,
             xrefs_table=xrefs_table,
             rels_table=rels_table,
+            prepare_statements=prepare_statements,
         )
 
     if lazy:
-        name_lookup = None
-    elif isinstance(name_data, str):
-        name_lookup = _get_lookup_from_path(name_data, desc=f"Processing names from {name_data}")
-    elif name_data is None:
-        from pyobo.resource_utils import ensure_ooh_na_na
-
-        name_lookup = _get_lookup_from_path(ensure_ooh_na_na(), desc="Processing names from zenodo")
-    elif isinstance(name_data, pd.DataFrame):
-        name_lookup = _get_lookup_from_df(name_data, desc="Processing names from dataframe")
-    else:
-        raise TypeError(f"invalid type for `name_data`: {name_data}")
+        return _prepare_backend_with_lookup()
+
+    import pandas as pd
+
+    sources = {
+        "names": _get_source(name_data, "name_data", "ensure_ooh_na_na"),
+        "species": _get_source(species_data, "species_data", "ensure_species"),
+        "alts": _get_source(alts_data, "alt_data", "ensure_alts"),
+        "defs": _get_source(defs_data, "defs_data", "ensure_definitions"),
+    }
+    lookups = {}
+    paths = {}
+    for key, (data, label) in sources.items():
+        desc = f"Processing {key} from {label}"
+        if isinstance(data, pd.DataFrame):
+            lookups[key] = _get_lookup_from_df(data, desc=desc)
+        else:
+            paths[key] = data, desc
+
+    if len(paths) == 1:
+        for key, (path, desc) in paths.items():
+            lookups[key] = _get_lookup_from_path(path, desc=desc)
+    elif paths:
+        # the cores are split between the files, so they don't oversubscribe the CPU
+        parallelization = max(1, (os.cpu_count() or 1) // len(paths))
+        # Each file gets its own thread. Decompression and pandas' C parser release the
+        # GIL for most of their work, and unlike with processes, the finished lookups,
+        # which can be several gigabytes, don't have to be pickled back
+        with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+            futures = {
+                key: executor.submit(
+                    _get_lookup_from_path, path, desc=desc, parallelization=parallelization
+                )
+                for key, (path, desc) in paths.items()
+            }
+            for key, future in futures.items():
+                lookups[key] = future.result()
 
-    if lazy:
-        species_lookup = None
-    elif isinstance(species_data, str):
-        species_lookup = _get_lookup_from_path(
-            species_data, desc=f"Processing species from {species_data}"
-        )
-    elif species_data is None:
-        from pyobo.resource_utils import ensure_species
+    return _prepare_backend_with_lookup(
+        name_lookup=lookups["names"],
+        alts_lookup=lookups["alts"],
+        defs_lookup=lookups["defs"],
+        species_lookup=lookups["species"],
+    )
 
-        species_lookup = _get_lookup_from_path(
-            ensure_species(), desc="Processing species from zenodo"
-        )
-    elif isinstance(species_data, pd.DataFrame):
-        species_lookup = _get_lookup_from_df(species_data, desc="Processing species from dataframe")
-    else:
-        raise TypeError(f"invalid type for `species_data`: {species_data}")
 
-    if lazy:
-        alts_lookup = None
-    elif isinstance(alts_data, str):
-        alts_lookup = _get_lookup_from_path(alts_data, desc=f"Processing alts from {alts_data}")
-    elif alts_data is None and not lazy:
-        from pyobo.resource_utils import ensure_alts
-
-        alts_lookup = _get_lookup_from_path(ensure_alts(), desc="Processing alts from zenodo")
-    elif isinstance(alts_data, pd.DataFrame):
-        alts_lookup = _get_lookup_from_df(alts_data, desc="Processing alts from dataframe")
-    else:
-        raise TypeError(f"invalid type for `alt_data`: {alts_data}")
+def _get_source(
+    data: Union[None, str, "pd.DataFrame"], key: str, ensure: str
+) -> Tuple[Union[str, Path, "pd.DataFrame"], str]:
+    import pandas as pd
 
-    if lazy:
-        defs_lookup = None
-    elif isinstance(defs_data, str):
-        defs_lookup = _get_lookup_from_path(defs_data, desc=f"Processing defs from {defs_data}")
-    elif defs_data is None and not lazy:
-        from pyobo.resource_utils import ensure_definitions
-
-        defs_lookup = _get_lookup_from_path(
-            ensure_definitions(), desc="Processing defs from zenodo"
-        )
-    elif isinstance(defs_data, pd.DataFrame):
-        defs_lookup = _get_lookup_from_df(defs_data, desc="Processing defs from dataframe")
-    else:
-        raise TypeError(f"invalid type for `defs_data`: {defs_data}")
+    if isinstance(data, str):
+        return data, data
+    elif data is None:
+        import pyobo.resource_utils
 
-    return _prepare_backend_with_lookup(
-        name_lookup=name_lookup,
-        alts_lookup=alts_lookup,
-        defs_lookup=defs_lookup,
-        species_lookup=species_lookup,
-    )
+        # download before loading so the workers don't race on the cache
+        return getattr(pyobo.resource_utils, ensure)(), "zenodo"
+    elif isinstance(data, pd.DataFrame):
+        return data, "dataframe"
+    else:
+        raise TypeError(f"invalid type for `{key}`: {data}")
 
 
 def _get_lookup_from_df(
-    df: pd.DataFrame, desc: Optional[str] = None
+    df: "pd.DataFrame", desc: Optional[str] = None
 ) -> Mapping[str, Mapping[str, str]]:
-    lookup: DefaultDict[str, Dict[str, str]] = defaultdict(dict)
     if desc is None:
         desc = "processing mappings from df"
-    it = tqdm(df.values, total=len(df.index), desc=desc, unit_scale=True)
-    for prefix, identifier, name in it:
-        lookup[prefix][identifier] = name
-    return dict(lookup)
+    logger.info("%s (%d rows)", desc, len(df.index))
+    prefix_column, identifier_column, value_column = df.columns
+    return {
+        prefix: dict(
+            zip(group[identifier_column].to_numpy(), group[value_column].to_numpy())
+        )
+        for prefix, group in df.groupby(prefix_column, sort=False)
+    }
 
 
 def _get_lookup_from_path(
-    path: Union[str, Path], desc: Optional[str] = None
+    path: Union[str, Path], desc: Optional[str] = None, parallelization: int = 0
 ) -> Mapping[str, Mapping[str, str]]:
+    import pandas as pd
+
     lookup: DefaultDict[str, Dict[str, str]] = defaultdict(dict)
     if desc is None:
         desc = "loading mappings"
-    with gzip.open(path, "rt") as file:
-        _ = next(file)
-        for line in tqdm(file, desc=desc, unit_scale=True):
-            prefix, identifier, name = line.strip().split("\t")
-            lookup[prefix][identifier] = name
+    with _open_gzip(path, parallelization=parallelization) as file:
+        # Parse with pandas' C reader in chunks, so the whole file is never held as a
+        # dataframe. The files are written without quoting, so quote characters must be
+        # kept as-is, and values like "NA" must stay strings
+        chunks = pd.read_csv(
+            file,
+            sep="\t",
+            header=0,
+            names=["prefix", "identifier", "value"],
+            # prefixes repeat on nearly every row, so they're parsed as categories, which
+            # only creates one string per distinct prefix and lets groupby use the codes
+            dtype={"prefix": "category", "identifier": str, "value": str},
+            quoting=csv.QUOTE_NONE,
+            na_filter=False,
+            chunksize=CHUNKSIZE,
+        )
+        # progress is only shown on a terminal, e.g., not when starting in a container
+        with tqdm(desc=desc, unit_scale=True, disable=None) as progress:
+            for chunk in chunks:
+                # like when each line was stripped, trailing whitespace such as a carriage
+                # return from files written on Windows isn't kept as part of the value
+                chunk["value"] = chunk["value"].str.rstrip()
+                for prefix, group in chunk.groupby("prefix", sort=False, observed=True):
+                    lookup[prefix].update(
+                        zip(group["identifier"].to_numpy(), group["value"].to_numpy())
+                    )
+                progress.update(len(chunk.index))
     return dict(lookup)
 
 
+def _open_gzip(path: Union[str, Path], parallelization: int = 0):
+    if rapidgzip is not None:
+        # zero uses as many threads as there are cores
+        return rapidgzip.open(str(path), parallelization=parallelization)
+    return gzip.open(path, "rb")
+
+
 def _prepare_backend_with_lookup(
     name_lookup: Optional[Mapping[str, Mapping[str, str]]] = None,
     alts_lookup: Optional[Mapping[str, Mapping[str, str]]] = None,
@@ -177,7 +246,9 @@ def _h(lookup, alt_lookup):
     if lookup is None:  # lazy mode, will download/cache data as needed
         return alt_lookup, Counter
 
+    @lru_cache(maxsize=1)
     def _summarize():
-        return Counter({k: len(v) for k, v in lookup.items()})
+        # the lookup doesn't change, so this only needs to be counted once
+        return {k: len(v) for k, v in lookup.items()}
 
     return lookup.get, _summarize
@@ -3,15 +3,33 @@
 """An BLS backend that communicates with a SQL database."""
 
 import logging
-import time
-from collections import Counter
+import threading
+import zlib
+from collections import defaultdict
+from contextlib import closing, contextmanager
 from functools import lru_cache
-from typing import Any, Iterable, List, Mapping, Optional, Tuple, Union
+from typing import (
+    Any,
+    Collection,
+    DefaultDict,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
-from sqlalchemy import create_engine, text
-from sqlalchemy.engine import Engine
+from sqlalchemy import bindparam, create_engine, inspect, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import ArgumentError
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.sql.elements import TextClause
 
-from .backend import Backend
+from .backend import CACHE_SIZE, Backend, _parse_curie
 from ..constants import (
     ALTS_TABLE_NAME,
     DEFS_TABLE_NAME,
@@ -26,6 +44,7 @@ from ..constants import (
 
 __all__ = [
     "RawSQLBackend",
+    "PreloadedSQLBackend",
 ]
 
 logger = logging.getLogger(__name__)
@@ -35,16 +54,46 @@ def _ensure_engine(
     engine: Union[None, str, Engine], engine_kwargs: Optional[Mapping[str, Any]] = None
 ) -> Engine:
     if engine is None:
-        return create_engine(get_sqlalchemy_uri(), **(engine_kwargs or {}))
-    elif isinstance(engine, str):
-        return create_engine(engine, **(engine_kwargs or {}))
+        engine = get_sqlalchemy_uri()
+    if isinstance(engine, str):
+        return create_engine(engine, **_get_engine_kwargs(engine, engine_kwargs))
     else:
         return engine
 
 
+def _get_engine_kwargs(
+    uri: str, engine_kwargs: Optional[Mapping[str, Any]] = None
+) -> Dict[str, Any]:
+    rv: Dict[str, Any] = dict(
+        # check connections before using them and replace them periodically
+        # so ones dropped by the server or a proxy aren't handed out
+        pool_pre_ping=True,
+        pool_recycle=300,
+    )
+    if make_url(uri).get_backend_name() != "sqlite":
+        # SQLite's default pools don't take a size
+        rv.update(pool_size=10, max_overflow=20)
+    rv.update(engine_kwargs or {})
+    return rv
+
+
+def _get_markers(paramstyle: str, n: int) -> List[str]:
+    if paramstyle in {"format", "pyformat"}:
+        return ["%s"] * n
+    if paramstyle == "qmark":
+        return ["?"] * n
+    if paramstyle == "numeric":
+        return [f":{i}" for i in range(1, n + 1)]
+    raise ValueError(f"unsupported DBAPI paramstyle: {paramstyle}")
+
+
 class RawSQLBackend(Backend):
     """A backend that communicates with low-level SQL statements."""
 
+    supports_synonyms = True
+    supports_xrefs = True
+    supports_rels = True
+
     #: The engine
     engine: Engine
 
@@ -61,6 +110,7 @@ class RawSQLBackend(Backend):
         synonyms_table: Optional[str] = None,
         xrefs_table: Optional[str] = None,
         rels_table: Optional[str] = None,
+        prepare_statements: bool = True,
     ):
         """Initialize the raw SQL backend.
 
@@ -74,6 +124,10 @@ class RawSQLBackend(Backend):
         :param synonyms_table: A name for the prefix-id-synonym table.
         :param xrefs_table: A name for the prefix-id-xprefix-xidentifier-provenance table.
         :param rels_table: A name for the relation table.
+        :param prepare_statements: If using PostgreSQL, should the lookup queries be prepared
+            once on each connection so they're not parsed and planned again for every lookup?
+            This should be turned off if connecting through a pooler in transaction mode,
+            like PgBouncer, since prepared statements belong to a single session.
         """
         self.engine = _ensure_engine(engine, engine_kwargs=engine_kwargs)
 
@@ -86,8 +140,85 @@ class RawSQLBackend(Backend):
         self.xrefs_table = xrefs_table or XREFS_NAME
         self.rels_table = rels_table or RELS_NAME
 
-    def _count_summary(self, table):
-        return self._get_one(f"SELECT SUM(identifier_count) FROM {table}_summary;")  # noqa:S608
+        # The hot path skips SQLAlchemy's statement and row processing, so the
+        # SQL is pre-rendered once using the DBAPI driver's own paramstyle. The
+        # connection used by the current thread's lookup is kept here
+        self._local = threading.local()
+        first, second = _get_markers(self.engine.dialect.paramstyle, 2)
+        self._row_sql = (
+            f"SELECT name, species, definition FROM {self.derived_table}"  # noqa:S608
+            f" WHERE prefix = {first} AND identifier = {second};"
+        )
+        self._alt_sql = (
+            f"SELECT identifier FROM {self.alts_table}"  # noqa:S608
+            f" WHERE prefix = {first} AND alt = {second};"
+        )
+        self._many_columns = {
+            self.synonyms_table: ("synonym",),
+            self.xrefs_table: ("xref_prefix", "xref_identifier", "provenance"),
+            self.rels_table: (
+                "relation_prefix",
+                "relation_identifier",
+                "target_prefix",
+                "target_identifier",
+            ),
+        }
+        self._many_sql = {
+            table: (
+                f"SELECT {', '.join(columns)} FROM {table}"  # noqa:S608
+                f" WHERE prefix = {first} AND identifier = {second};"
+            )
+            for table, columns in self._many_columns.items()
+        }
+        self._prepare_sql: List[Tuple[str, str]] = []
+        if prepare_statements and self.engine.dialect.name == "postgresql":
+            self._row_sql = self._add_prepared(self._row_sql)
+            self._alt_sql = self._add_prepared(self._alt_sql)
+            self._many_sql = {
+                table: self._add_prepared(sql) for table, sql in self._many_sql.items()
+            }
+
+    def _add_prepared(self, sql: str) -> str:
+        body = sql.rstrip(";").replace("%s", "$1", 1).replace("%s", "$2", 1)
+        # the name depends on the statement, so backends for different tables that
+        # share an engine, and therefore DBAPI connections, don't clash
+        name = f"biolookup_{zlib.crc32(body.encode('utf-8')):08x}"
+        self._prepare_sql.append((name, f"PREPARE {name} (text, text) AS {body}"))
+        return f"EXECUTE {name} (%s, %s);"
+
+    def _prepare(self, connection) -> None:
+        if not self._prepare_sql:
+            return
+        # Prepared statements belong to the DBAPI connection, which goes back to the
+        # pool and gets handed to other threads, so the ones that were already prepared
+        # are tracked in its info dictionary, which is cleared if it's invalidated
+        prepared = connection.connection.info.setdefault("biolookup_prepared", set())
+        statements = [(name, sql) for name, sql in self._prepare_sql if name not in prepared]
+        if not statements:
+            return
+        with closing(connection.connection.cursor()) as cursor:
+            cursor.execute(";".join(sql for _, sql in statements))
+        prepared.update(name for name, _ in statements)
+
+    def warm_up(self) -> None:
+        """Fill the caches and open connections so the first requests don't wait on them."""
+        super().warm_up()
+        pool = self.engine.pool
+        if not isinstance(pool, QueuePool):
+            # e.g., SQLite's default pools, which don't keep a fixed number of connections
+            return
+        connections = []
+        try:
+            for _ in range(pool.size() - pool.checkedin()):
+                connections.append(self.engine.connect())
+        finally:
+            # closing returns them to the pool, authenticated and ready to use
+            for connection in connections:
+                connection.close()
+
+    def _count_summary(self, table) -> int:
+        # the summary is cached, so the counts don't need their own queries
+        return sum(self._get_summary(table).values())
 
     @lru_cache(maxsize=1)
     def count_names(self) -> int:
@@ -97,13 +228,7 @@ class RawSQLBackend(Backend):
     @lru_cache(maxsize=1)
     def count_prefixes(self) -> int:
         """Count prefixes using a SQL query to the references summary table."""
-        logger.info("counting prefixes")
-        start = time.time()
-        rv = self._get_one(
-            f"SELECT COUNT(DISTINCT prefix) FROM {self.refs_table}_summary;"  # noqa:S608
-        )
-        logger.info("done counting prefixes after %.2fs", time.time() - start)
-        return rv
+        return len(self._get_summary(self.refs_table))
 
     @lru_cache(maxsize=1)
     def count_definitions(self) -> int:
@@ -113,7 +238,6 @@ class RawSQLBackend(Backend):
     @lru_cache(maxsize=1)
     def count_species(self) -> Optional[int]:
         """Count species using a SQL query to the species summary table."""
-        logger.info("counting species")
         return self._count_summary(self.species_table)
 
     @lru_cache(maxsize=1)
@@ -134,150 +258,421 @@ class RawSQLBackend(Backend):
     @lru_cache(maxsize=1)
     def count_alts(self) -> Optional[int]:
         """Count alts using a SQL query to the alts summary table."""
-        logger.info("counting alts")
-        return self._get_one(f"SELECT COUNT(*) FROM {self.alts_table};")  # noqa:S608
-
-    def _get_one(self, sql: str):
-        with self.engine.connect() as connection:
-            result = connection.execute(sql).fetchone()
-            return result[0]
+        return self._count_summary(self.alts_table)
 
-    def summarize_names(self) -> Counter:
+    def summarize_names(self) -> Mapping[str, int]:
         """Return the results of a SQL query that dumps the name summary table."""
         return self._get_summary(self.refs_table)
 
-    def summarize_alts(self) -> Counter:
+    def summarize_alts(self) -> Mapping[str, int]:
         """Return the results of a SQL query that dumps the alts summary table."""
         return self._get_summary(self.alts_table)
 
-    def summarize_definitions(self) -> Counter:
+    def summarize_definitions(self) -> Mapping[str, int]:
         """Return the results of a SQL query that dumps the definitions summary table."""
         return self._get_summary(self.defs_table)
 
-    def summarize_species(self) -> Counter:
+    def summarize_species(self) -> Mapping[str, int]:
         """Return the results of a SQL query that dumps the species summary table."""
         return self._get_summary(self.species_table)
 
-    def summarize_synonyms(self) -> Counter:
+    def summarize_synonyms(self) -> Mapping[str, int]:
         """Return the results of a SQL query that dumps the synonyms summary table."""
         return self._get_summary(self.synonyms_table)
 
-    def summarize_xrefs(self) -> Counter:
+    def summarize_xrefs(self) -> Mapping[str, int]:
         """Return the results of a SQL query that dumps the xrefs summary table."""
         return self._get_summary(self.xrefs_table)
 
-    def summarize_rels(self) -> Counter:
+    def summarize_rels(self) -> Mapping[str, int]:
         """Return the results of a SQL query that dumps the relations summary table."""
         return self._get_summary(self.rels_table)
 
-    @lru_cache()
-    def _get_summary(self, table) -> Counter:
-        sql = f"SELECT prefix, identifier_count FROM {table}_summary;"  # noqa:S608
-        with self.engine.connect() as connection:
-            return Counter(dict(connection.execute(sql).fetchall()))
+    def _get_summary(self, table) -> Mapping[str, int]:
+        return self._get_summaries()[table]
+
+    @lru_cache(maxsize=1)
+    def _get_summaries(self) -> Mapping[str, Mapping[str, int]]:
+        # all of the summary tables are small, so they're read in a single round trip.
+        # Databases built before some tables were added are missing their summaries,
+        # which are then left empty rather than failing the whole query
+        tables = [
+            self.refs_table,
+            self.alts_table,
+            self.defs_table,
+            self.species_table,
+            self.synonyms_table,
+            self.xrefs_table,
+            self.rels_table,
+        ]
+        rv: Dict[str, Dict[str, int]] = {table: {} for table in tables}
+        inspector = inspect(self.engine)
+        existing = [table for table in tables if inspector.has_table(f"{table}_summary")]
+        if not existing:
+            return rv
+        sql = " UNION ALL ".join(
+            f"SELECT '{table}', prefix, identifier_count FROM {table}_summary"  # noqa:S608
+            for table in existing
+        )
+        for table, prefix, count in self._fetchall_raw(sql):
+            rv[table][prefix] = count
+        return rv
+
+    @lru_cache(maxsize=1)
+    def _get_prefixes(self) -> FrozenSet[str]:
+        # this only needs the names summary, so it doesn't depend on the other tables
+        sql = f"SELECT prefix FROM {self.refs_table}_summary;"  # noqa:S608
+        return frozenset(prefix for (prefix,) in self._fetchall_raw(sql))
 
-    @lru_cache()
     def has_prefix(self, prefix: str) -> bool:
-        """Check for the prefix with a SQL query."""
-        sql = text(
-            f"SELECT EXISTS(SELECT 1 from {self.derived_table} WHERE prefix = :prefix);"  # noqa:S608
+        """Check for the prefix in the prefixes listed by the names summary table."""
+        return prefix in self._get_prefixes()
+
+    @lru_cache(maxsize=CACHE_SIZE)
+    def _lookup_reference(
+        self, prefix: str, identifier: str, *, resolve_alternate: bool = True
+    ) -> Mapping[str, Any]:
+        # Both hits and misses are cached by the parsed prefix and identifier since the
+        # database does not change while the service is running. Results get copied
+        # when the query is added, but nested values are shared and shouldn't be modified.
+        with self._connect():
+            return super()._lookup_reference(
+                prefix, identifier, resolve_alternate=resolve_alternate
+            )
+
+    def lookup_many(
+        self, curies: Iterable[str], *, resolve_alternate: bool = True
+    ) -> List[Mapping[str, Any]]:
+        """Return the results and summaries when resolving several CURIE strings.
+
+        Rather than running several queries per CURIE, identifiers are grouped
+        by prefix and each table is queried once per prefix.
+
+        :param curies: The CURIEs to look up
+        :param resolve_alternate: Should alternate identifiers be resolved to their
+            primary identifiers?
+        :return: A result for each CURIE, in the same order
+        """
+        curies = list(curies)
+        references = {
+            (prefix, identifier)
+            for prefix, identifier in map(_parse_curie, curies)
+            if prefix is not None and identifier is not None and self.has_prefix(prefix)
+        }
+        rows = self._fetch_grouped(
+            "name, species, definition", table=self.derived_table, references=references
         )
+        alts: Dict[Tuple[str, str], str] = {}
+        if resolve_alternate:
+            alts = {
+                reference: values[0][0]
+                for reference, values in self._fetch_grouped(
+                    "identifier",
+                    table=self.alts_table,
+                    key="alt",
+                    references=references.difference(rows),
+                ).items()
+            }
+            primary_references = {(prefix, identifier) for (prefix, _), identifier in alts.items()}
+            rows.update(
+                self._fetch_grouped(
+                    "name, species, definition",
+                    table=self.derived_table,
+                    references=primary_references,
+                )
+            )
+            references.update(primary_references)
+
+        backend = _PrefetchedBackend(
+            prefixes=self._get_prefixes(),
+            rows={reference: values[0] for reference, values in rows.items()},
+            alts=alts,
+            synonyms=self._fetch_grouped(
+                "synonym", table=self.synonyms_table, references=references
+            ),
+            xrefs=self._fetch_grouped(
+                "xref_prefix, xref_identifier, provenance",
+                table=self.xrefs_table,
+                references=references,
+            ),
+            rels=self._fetch_grouped(
+                "relation_prefix, relation_identifier, target_prefix, target_identifier",
+                table=self.rels_table,
+                references=references,
+            ),
+        )
+        return backend.lookup_many(curies, resolve_alternate=resolve_alternate)
+
+    def _fetch_grouped(
+        self,
+        columns: str,
+        *,
+        table: str,
+        references: Collection[Tuple[str, str]],
+        key: str = "identifier",
+    ) -> Dict[Tuple[str, str], List[Tuple[Any, ...]]]:
+        """Get rows for several prefix/identifier pairs with one query per prefix."""
+        identifiers: DefaultDict[str, Set[str]] = defaultdict(set)
+        for prefix, identifier in references:
+            identifiers[prefix].add(identifier)
+        rv: DefaultDict[Tuple[str, str], List[Tuple[Any, ...]]] = defaultdict(list)
+        if not identifiers:
+            return rv
+        sql = self._get_grouped_statement(columns, table, key)
         with self.engine.connect() as connection:
-            result = connection.execute(sql, prefix=prefix).fetchone()
-            return bool(result)
+            for prefix, prefix_identifiers in identifiers.items():
+                results = connection.execute(
+                    sql, prefix=prefix, identifiers=sorted(prefix_identifiers)
+                )
+                for identifier, *values in results:
+                    rv[prefix, identifier].append(tuple(values))
+        return rv
 
-    @lru_cache(maxsize=100_000)
-    def get_primary_id(self, prefix: str, identifier: str) -> str:
-        """Get the canonical identifier with a SQL query to the alts table."""
-        sql = text(
+    @lru_cache(maxsize=None)
+    def _get_grouped_statement(self, columns: str, table: str, key: str) -> TextClause:
+        # there are only a handful of these, so each is only built once
+        return text(
             f"""
-            SELECT identifier
-            FROM {self.alts_table}
-            WHERE prefix = :prefix and alt = :alt;
+            SELECT {key}, {columns}
+            FROM {table}
+            WHERE prefix = :prefix and {key} IN :identifiers;
         """  # noqa:S608
-        )
-        with self.engine.connect() as connection:
-            result = connection.execute(sql, prefix=prefix, alt=identifier).fetchone()
-            return result[0] if result else identifier
+        ).bindparams(bindparam("identifiers", expanding=True))
+
+    @lru_cache(maxsize=CACHE_SIZE)
+    def get_primary_id(self, prefix: str, identifier: str) -> str:
+        """Get the canonical identifier with a SQL query to the alts table."""
+        if not self.has_prefix(prefix):
+            return identifier
+        result = self._fetchone_raw(self._alt_sql, prefix, identifier)
+        return result[0] if result else identifier
 
     def get_name(self, prefix: str, identifier: str) -> Optional[str]:
-        """Get the name with a SQL query to the names table."""
-        return self._help_one("name", prefix, identifier)
+        """Get the name with a SQL query to the derived table."""
+        return self._get_row(prefix, identifier)[0]
 
     def get_species(self, prefix: str, identifier: str) -> Optional[str]:
-        """Get the species with a SQL query to the species table."""
-        return self._help_one("species", prefix, identifier)
+        """Get the species with a SQL query to the derived table."""
+        return self._get_row(prefix, identifier)[1]
 
     def get_definition(self, prefix: str, identifier: str) -> Optional[str]:
-        """Get the definition with a SQL query to the definitions table."""
-        return self._help_one("definition", prefix, identifier)
-
-    @lru_cache(maxsize=100_000)
-    def _help_one(self, column: str, prefix: str, identifier: str) -> Optional[str]:
-        sql = text(
-            f"""
-            SELECT {column}
-            FROM {self.derived_table}
-            WHERE prefix = :prefix and identifier = :identifier;
-        """
-        )  # noqa:S608
+        """Get the definition with a SQL query to the derived table."""
+        return self._get_row(prefix, identifier)[2]
+
+    def _get_row(
+        self, prefix: str, identifier: str
+    ) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        # the cached query is kept separate, so subclasses that don't need it can
+        # override this without going through the cache
+        return self._fetch_row(prefix, identifier)
+
+    @lru_cache(maxsize=CACHE_SIZE)
+    def _fetch_row(
+        self, prefix: str, identifier: str
+    ) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        # the name, species, and definition are all fetched in one round trip since
+        # a lookup needs all three
+        if not self.has_prefix(prefix):
+            return None, None, None
+        result = self._fetchone_raw(self._row_sql, prefix, identifier)
+        if result:
+            return result[0], result[1], result[2]
+        return None, None, None
+
+    @contextmanager
+    def _connect(self):
+        # Connections are checked out of the pool for a whole lookup, so its queries share
+        # one, and nested calls reuse it. They're returned afterwards rather than kept by
+        # the thread, so the pool can ping and recycle them and isn't exhausted by threads
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            yield connection
+            return
         with self.engine.connect() as connection:
-            result = connection.execute(sql, prefix=prefix, identifier=identifier).fetchone()
-            if result:
-                return result[0]
-        return None
+            try:
+                # skip the BEGIN and ROLLBACK around each lookup's read-only queries
+                connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+            except ArgumentError:
+                logger.debug("autocommit is not supported by %s", self.engine.dialect.name)
+            try:
+                self._prepare(connection)
+            except self.engine.dialect.dbapi.Error:
+                connection.invalidate()
+                raise
+            self._local.connection = connection
+            try:
+                yield connection
+            finally:
+                self._local.connection = None
+
+    def _fetchone_raw(self, sql: str, *params: str) -> Optional[Tuple[Any, ...]]:
+        return self._execute_raw(sql, params, lambda cursor: cursor.fetchone())
+
+    def _fetchall_raw(self, sql: str, *params: str) -> List[Tuple[Any, ...]]:
+        return self._execute_raw(sql, params, lambda cursor: cursor.fetchall())
+
+    def _execute_raw(self, sql, params, fetch):
+        with self._connect() as connection:
+            try:
+                with closing(connection.connection.cursor()) as cursor:
+                    cursor.execute(sql, params)
+                    return fetch(cursor)
+            except self.engine.dialect.dbapi.Error:
+                # don't return a connection that might have gone bad to the pool
+                connection.invalidate()
+                raise
 
     def get_synonyms(self, prefix: str, identifier: str) -> List[str]:
         """Get synonyms with a SQL query to the synonyms table."""
-        return self._help_many(
-            "synonym", table=self.synonyms_table, prefix=prefix, identifier=identifier
-        )
+        results = self._fetchmany(self.synonyms_table, prefix=prefix, identifier=identifier)
+        return [synonym for synonym, in results]
 
     def get_xrefs(self, prefix: str, identifier: str) -> List[Mapping[str, str]]:
         """Get xrefs with a SQL query to the xrefs table."""
-        return self._help_many_dict(
-            "xref_prefix",
-            "xref_identifier",
-            "provenance",
-            table=self.xrefs_table,
-            prefix=prefix,
-            identifier=identifier,
-        )
+        return self._help_many_dict(self.xrefs_table, prefix=prefix, identifier=identifier)
 
     def get_rels(self, prefix: str, identifier: str) -> List[Mapping[str, str]]:
         """Get relations with a SQL query to the relations table."""
-        return self._help_many_dict(
-            "relation_prefix",
-            "relation_identifier",
-            "target_prefix",
-            "target_identifier",
-            table=self.rels_table,
-            prefix=prefix,
-            identifier=identifier,
-        )
-
-    def _help_many(self, column: str, *, table: str, prefix: str, identifier: str) -> List[str]:
-        results = self._fetchmany(column, table=table, prefix=prefix, identifier=identifier)
-        return [result for result, in results]
+        return self._help_many_dict(self.rels_table, prefix=prefix, identifier=identifier)
 
     def _help_many_dict(
-        self, *columns: str, table: str, prefix: str, identifier: str
+        self, table: str, *, prefix: str, identifier: str
     ) -> List[Mapping[str, str]]:
-        results = self._fetchmany(
-            ", ".join(columns), table=table, prefix=prefix, identifier=identifier
-        )
+        columns = self._many_columns[table]
+        results = self._fetchmany(table, prefix=prefix, identifier=identifier)
         return [dict(zip(columns, result)) for result in results]
 
-    def _fetchmany(
-        self, columns: str, table: str, prefix: str, identifier: str
-    ) -> Iterable[Tuple[str]]:
-        sql = text(
-            f"""
-            SELECT {columns}
-            FROM {table}
-            WHERE prefix = :prefix and identifier = :identifier;
+    def _fetchmany(self, table: str, *, prefix: str, identifier: str) -> List[Tuple[Any, ...]]:
+        return self._fetchall_raw(self._many_sql[table], prefix, identifier)
+
+
+class PreloadedSQLBackend(RawSQLBackend):
+    """A SQL backend that keeps the names, species, and definitions in memory.
+
+    The derived table is read once when the backend is constructed, so looking
+    up a name, species, or definition is a dictionary lookup rather than a query.
+    Everything else, like alternate identifiers, synonyms, xrefs, and relations,
+    still comes from the database.
+    """
+
+    def __init__(self, *args, chunksize: int = 100_000, **kwargs) -> None:
+        """Initialize the backend and load the derived table.
+
+        :param args: Positional arguments passed to :class:`RawSQLBackend`
+        :param chunksize: The number of rows fetched from the derived table at a time
+        :param kwargs: Keyword arguments passed to :class:`RawSQLBackend`
         """
-        )  # noqa:S608
+        super().__init__(*args, **kwargs)
+        # Rows are sharded by prefix like the in-memory lookups, which avoids keeping
+        # a prefix/identifier tuple as the key of every row
+        self._rows: DefaultDict[
+            str, Dict[str, Tuple[Optional[str], Optional[str], Optional[str]]]
+        ] = defaultdict(dict)
+        sql = text(
+            "SELECT prefix, identifier, name, species, definition"  # noqa:S608
+            f" FROM {self.derived_table};"
+        )
         with self.engine.connect() as connection:
-            results = connection.execute(sql, prefix=prefix, identifier=identifier).fetchall()
-        return results
+            # stream the results, so the whole table never has to be held by the driver
+            result = connection.execution_options(stream_results=True).execute(sql)
+            for rows in iter(lambda: result.fetchmany(chunksize), []):
+                for prefix, identifier, name, species, definition in rows:
+                    self._rows[prefix][identifier] = name, species, definition
+        # Don't keep the connection used for preloading in the pool, since a server like
+        # gunicorn forks its workers after this, and they would share the same socket
+        self.engine.dispose()
+        logger.info("preloaded %d prefixes from %s", len(self._rows), self.derived_table)
+
+    def _get_row(
+        self, prefix: str, identifier: str
+    ) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        rows = self._rows.get(prefix)
+        if rows is None:
+            return None, None, None
+        return rows.get(identifier, (None, None, None))
+
+
+class _PrefetchedBackend(Backend):
+    """A view over results pre-fetched by :meth:`RawSQLBackend.lookup_many`."""
+
+    supports_synonyms = True
+    supports_xrefs = True
+    supports_rels = True
+
+    def __init__(
+        self,
+        *,
+        prefixes: Collection[str],
+        rows: Mapping[Tuple[str, str], Tuple[Any, ...]],
+        alts: Mapping[Tuple[str, str], str],
+        synonyms: Mapping[Tuple[str, str], List[Tuple[Any, ...]]],
+        xrefs: Mapping[Tuple[str, str], List[Tuple[Any, ...]]],
+        rels: Mapping[Tuple[str, str], List[Tuple[Any, ...]]],
+    ):
+        """Initialize the view.
+
+        :param prefixes: The prefixes available in the database
+        :param rows: A mapping from prefix/identifier pairs to name, species, and definition
+        :param alts: A mapping from prefix/alternate identifier pairs to primary identifiers
+        :param synonyms: A mapping from prefix/identifier pairs to synonym rows
+        :param xrefs: A mapping from prefix/identifier pairs to xref rows
+        :param rels: A mapping from prefix/identifier pairs to relation rows
+        """
+        self.prefixes = prefixes
+        self.rows = rows
+        self.alts = alts
+        self.synonyms = synonyms
+        self.xrefs = xrefs
+        self.rels = rels
+
+    def has_prefix(self, prefix: str) -> bool:
+        """Check for the prefix in the pre-fetched prefixes."""
+        return prefix in self.prefixes
+
+    def get_primary_id(self, prefix: str, identifier: str) -> str:
+        """Get the canonical identifier from the pre-fetched alts."""
+        return self.alts.get((prefix, identifier), identifier)
+
+    def _get_column(self, index: int, prefix: str, identifier: str) -> Optional[str]:
+        row = self.rows.get((prefix, identifier))
+        return row[index] if row else None
+
+    def get_name(self, prefix: str, identifier: str) -> Optional[str]:
+        """Get the name from the pre-fetched rows."""
+        return self._get_column(0, prefix, identifier)
+
+    def get_definition(self, prefix: str, identifier: str) -> Optional[str]:
+        """Get the definition from the pre-fetched rows."""
+        return self._get_column(2, prefix, identifier)
+
+    def get_species(self, prefix: str, identifier: str) -> Optional[str]:
+        """Get the species from the pre-fetched rows."""
+        return self._get_column(1, prefix, identifier)
+
+    def get_synonyms(self, prefix: str, identifier: str) -> List[str]:
+        """Get the synonyms from the pre-fetched rows."""
+        return [synonym for synonym, in self.synonyms.get((prefix, identifier), [])]
+
+    def get_xrefs(self, prefix: str, identifier: str) -> List[Mapping[str, str]]:
+        """Get the xrefs from the pre-fetched rows."""
+        return [
+            dict(zip(("xref_prefix", "xref_identifier", "provenance"), row))
+            for row in self.xrefs.get((prefix, identifier), [])
+        ]
+
+    def get_rels(self, prefix: str, identifier: str) -> List[Mapping[str, str]]:
+        """Get the relations from the pre-fetched rows."""
+        return [
+            dict(
+                zip(
+                    (
+                        "relation_prefix",
+                        "relation_identifier",
+                        "target_prefix",
+                        "target_identifier",
+                    ),
+                    row,
+                )
+            )
+            for row in self.rels.get((prefix, identifier), [])
+        ]
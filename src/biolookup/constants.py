@@ -2,6 +2,8 @@
 
 """Constants for the biolookup service."""
 
+from typing import Optional
+
 import pystow
 
 REFS_TABLE_NAME = "obo_reference"
@@ -29,3 +31,19 @@ def get_sqlalchemy_uri() -> str:
 
     # Default value
     return MODULE.joinpath_sqlite(name="biolookup.db")
+
+
+def get_cache_size() -> Optional[int]:
+    """Get the maximum number of entries kept in each of the SQL backend's lookup caches.
+
+    This can be configured with the ``BIOLOOKUP_CACHE_SIZE`` environment variable (or any
+    other valid way with :mod:`pystow`). A value of zero or less removes the bound, which
+    also lets :func:`functools.lru_cache` skip its bookkeeping. This is a good choice for
+    long-running servers with enough memory to hold their working set.
+
+    :return: The maximum number of entries, or none if the caches are unbounded
+    """
+    rv = pystow.get_config("biolookup", "cache_size", dtype=int, default=100_000)
+    if rv <= 0:
+        return None
+    return rv
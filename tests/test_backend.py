@@ -4,19 +4,35 @@
 
 import gzip
 import tempfile
+import threading
 import unittest
 from pathlib import Path
 from typing import ClassVar, Type
 
+import bioregistry
 import pyobo
 import pystow
 from flask import Flask
 
+from biolookup.app.blueprints import MAX_BATCH_SIZE
 from biolookup.app.wsgi import get_app_from_backend
-from biolookup.backends import Backend, MemoryBackend, RawSQLBackend, get_backend
+from biolookup.backends import (
+    ArrowBackend,
+    Backend,
+    MemoryBackend,
+    PreloadedSQLBackend,
+    RawSQLBackend,
+    get_backend,
+)
+from biolookup.backends.backend import _get_providers
 from biolookup.constants import DEFAULT_ENDPOINT
 from biolookup.db import loader
 
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
 TEST_URI = pystow.get_config("biolookup", "test_uri")
 REFS = [
     ("go", "0000073", "initial mitotic spindle pole body separation"),
@@ -79,6 +95,10 @@ class BackendTestCase(unittest.TestCase):
             self.assertEqual(5, backend.count_definitions())
             self.assertEqual(1, backend.count_alts())
             self.assertEqual(3, backend.count_species(), msg="Got wrong number of species")
+            all_counts = backend.count_all()
+            self.assertEqual(2, all_counts["prefixes"])
+            self.assertEqual(6, all_counts["names"])
+            self.assertEqual(1, all_counts["alts"])
 
             self.assertEqual({"go": 3, "hgnc": 3}, dict(backend.summarize_names()))
             self.assertEqual({"go": 3, "hgnc": 2}, dict(backend.summarize_definitions()))
@@ -126,6 +146,13 @@ class BackendTestCase(unittest.TestCase):
         self.assertEqual("9606", r["species"])
         self.assertEqual("hgnc:10020", r["query"])
 
+        # Test batch lookup gives the same results as individual lookup
+        curies = ["go:0000073", "go:0030475", "hgnc:10020", "hgnc:nope", "nope:nope"]
+        self.assertEqual(
+            [backend.lookup(curie) for curie in curies],
+            backend.lookup_many(curies),
+        )
+
     def assert_go_example(self, r):
         """Run test of the canonical GO example."""
         self.assertIsNotNone(r)
@@ -143,6 +170,16 @@ class BackendTestCase(unittest.TestCase):
             self.assertIsNotNone(res)
             self.assert_go_example(res.json)
 
+            res = client.post(f"/{DEFAULT_ENDPOINT}", json={"curies": ["go:0000073"]})
+            self.assertIsNotNone(res)
+            self.assertEqual(1, len(res.json))
+            self.assert_go_example(res.json[0])
+
+            res = client.post(
+                f"/{DEFAULT_ENDPOINT}", json={"curies": ["go:0000073"] * (MAX_BATCH_SIZE + 1)}
+            )
+            self.assertEqual(400, res.status_code)
+
 
 @unittest.skipUnless(TEST_URI, reason="No biolookup/test_uri configuration found")
 class TestRawSQLBackend(BackendTestCase):
@@ -150,6 +187,7 @@ class TestRawSQLBackend(BackendTestCase):
 
     backend_cls = RawSQLBackend
     counts = True
+    preload = False
 
     def setUp(self) -> None:
         """Set up the test case."""
@@ -210,6 +248,7 @@ class TestRawSQLBackend(BackendTestCase):
                 synonyms_table=self.synonyms_table,
                 xrefs_table=self.xrefs_table,
                 rels_table=self.rels_table,
+                preload=self.preload,
             )
 
     def test_backend(self):
@@ -221,6 +260,29 @@ class TestRawSQLBackend(BackendTestCase):
         app = get_app_from_backend(self.backend)
         self.assert_app_lookup(app)
 
+    def test_threads(self):
+        """Test queries from short-lived threads that reuse each other's pooled connections."""
+        results = []
+
+        def _query():
+            results.append(self.backend._fetchone_raw(self.backend._row_sql, "go", "0000073"))
+
+        for _ in range(2):
+            thread = threading.Thread(target=_query)
+            thread.start()
+            thread.join()
+        self.assertEqual(2, len(results))
+        self.assertIsNotNone(results[0])
+        self.assertEqual("initial mitotic spindle pole body separation", results[0][0])
+        self.assertEqual(results[0], results[1])
+
+
+class TestPreloadedSQLBackend(TestRawSQLBackend):
+    """Tests for the SQL backend that preloads the derived table."""
+
+    backend_cls = PreloadedSQLBackend
+    preload = True
+
 
 class TestMemoryBackend(BackendTestCase):
     """Tests for the in-memory backend."""
@@ -242,3 +304,61 @@ class TestMemoryBackend(BackendTestCase):
         """Test the app works properly."""
         app = get_app_from_backend(self.backend)
         self.assert_app_lookup(app)
+
+
+@unittest.skipIf(pyarrow is None, reason="pyarrow is not installed")
+class TestArrowBackend(BackendTestCase):
+    """Tests for the Arrow backend."""
+
+    backend_cls = ArrowBackend
+    counts = True
+
+    def setUp(self) -> None:
+        """Build the Arrow files in a temporary directory."""
+        self.directory = tempfile.TemporaryDirectory()
+        directory = Path(self.directory.name)
+        _write(directory / "refs.tsv.gz", REFS, "name")
+        _write(directory / "alts.tsv.gz", ALTS, "alt")
+        _write(directory / "defs.tsv.gz", DEFS, "definition")
+        _write(directory / "species.tsv.gz", SPECIES, "species")
+        self.backend = ArrowBackend.from_tsvs(
+            names=directory / "refs.tsv.gz",
+            alts=directory / "alts.tsv.gz",
+            definitions=directory / "defs.tsv.gz",
+            species=directory / "species.tsv.gz",
+            directory=directory,
+        )
+
+    def tearDown(self) -> None:
+        """Clean up the temporary directory."""
+        self.directory.cleanup()
+
+    def test_backend(self):
+        """Test the Arrow backend."""
+        self.help_check(self.backend, counts=self.counts)
+
+    def test_app(self):
+        """Test the app works properly."""
+        app = get_app_from_backend(self.backend)
+        self.assert_app_lookup(app)
+
+
+class TestProviders(unittest.TestCase):
+    """Tests for generating provider URLs."""
+
+    def test_providers(self):
+        """Test that rendering the cached templates gives the same URLs as the Bioregistry."""
+        for prefix, identifier in [
+            ("go", "0000073"),
+            ("hgnc", "10020"),
+            ("doid", "14330"),
+            ("chebi", "1234"),
+            ("chebi", "CHEBI:1234"),
+            ("mgi", "6214626"),
+            ("mgi", "MGI:6214626"),
+        ]:
+            with self.subTest(prefix=prefix, identifier=identifier):
+                self.assertEqual(
+                    bioregistry.get_providers(prefix, identifier),
+                    _get_providers(prefix, identifier),
+                )
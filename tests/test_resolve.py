@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for building in-memory lookups."""
+
+import gzip
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from biolookup.backends.resolve import _get_lookup_from_df, _get_lookup_from_path
+
+ROWS = [
+    ("go", "0000073", "initial mitotic spindle pole body separation"),
+    ("go", "0000075", "cell cycle checkpoint"),
+    ("hgnc", "10020", "RIPK2"),
+    ("hgnc", "10021", 'RIPK3 "receptor" kinase'),
+]
+EXPECTED = {
+    "go": {
+        "0000073": "initial mitotic spindle pole body separation",
+        "0000075": "cell cycle checkpoint",
+    },
+    "hgnc": {
+        "10020": "RIPK2",
+        "10021": 'RIPK3 "receptor" kinase',
+    },
+}
+
+
+class TestLookup(unittest.TestCase):
+    """Tests for building in-memory lookups."""
+
+    def test_from_path(self):
+        """Test building a lookup from a gzipped TSV file."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory).joinpath("names.tsv.gz")
+            with gzip.open(path, "wt") as file:
+                print("prefix", "identifier", "name", sep="\t", file=file)
+                for row in ROWS:
+                    print(*row, sep="\t", file=file)
+            self.assertEqual(EXPECTED, _get_lookup_from_path(path))
+
+    def test_from_path_trailing_whitespace(self):
+        """Test that trailing whitespace, like Windows line endings, is stripped from values."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory).joinpath("names.tsv.gz")
+            with gzip.open(path, "wt", newline="") as file:
+                print("prefix", "identifier", "name", sep="\t", end="\r\n", file=file)
+                for row in ROWS:
+                    print(*row, sep="\t", end=" \r\n", file=file)
+            self.assertEqual(EXPECTED, _get_lookup_from_path(path))
+
+    def test_from_df(self):
+        """Test building a lookup from a dataframe."""
+        df = pd.DataFrame(ROWS, columns=["prefix", "identifier", "name"])
+        self.assertEqual(EXPECTED, _get_lookup_from_df(df))